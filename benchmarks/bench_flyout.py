@@ -0,0 +1,165 @@
+"""Benchmark rendering the version selector menu into the pages of a versioned build.
+
+Renders ``versions.html`` for ``--pages`` pages listing ``--versions`` versions, the way the html builder does
+through :meth:`sphinx_versioned.sphinx_.EventHandlers.html_page_context`; once with the list of versions
+rendered once per version and, as a reference, with the previous template, which loops over all the versions
+on every page and resolves their paths on every access.
+
+    python benchmarks/bench_flyout.py --pages 5000 --versions 300
+"""
+
+import time
+import types
+import tempfile
+
+import jinja2
+import typer
+
+from sphinx_versioned.sphinx_ import EventHandlers
+from sphinx_versioned.versions import BuiltVersions, Ref, PseudoBranch, _BranchTag
+from sphinx_versioned.relink import TEMPLATES_DIR, VersionsFragment
+
+app = typer.Typer(add_completion=False)
+
+# `versions.html` before the list of versions was rendered once per version.
+REFERENCE_TEMPLATE = """\
+<div class="injected">
+  <div class="rst-versions {{ 'rst-badge' if floating_badge }}" data-toggle="rst-versions" role="note"
+    aria-label="versions">
+    <span class="rst-current-version" data-toggle="rst-current-version">
+      <span class="fa fa-book">&nbsp;&nbsp;Other versions&nbsp;&nbsp;</span>
+      v: {{ current_version }}
+      <span class="fa fa-caret-down"></span>
+    </span>
+    <div class="rst-other-versions">
+      {%- if versions.tags %}
+      <dl>
+        <dt>Tags</dt>
+        {%- for name, url in versions.tags.items() %}
+        <dd class="{{'rtd-current-item' if name==current_version }}">
+          <a href="{{ relpath }}{{ url }}">{{ name }}</a>
+        </dd>
+        {%- endfor %}
+      </dl>
+      {%- endif %}
+      {%- if versions.branches %}
+      <dl>
+        <dt>Branches</dt>
+        {%- for name, url in versions.branches.items() %}
+        <dd class="{{'rtd-current-item' if name==current_version }}">
+          <a href="{{ relpath }}{{ url }}">{{ name }}</a>
+        </dd>
+        {%- endfor %}
+      </dl>
+      {%- endif %}
+      {%- if project_url %}
+      <dl>
+        <dt>Project home</dt>
+        <dd>
+          <a href="{{ project_url }}">View</a>
+        </dd>
+      </dl>
+      {%- endif %}
+      <dl>
+        <dt>Search</dt>
+        <dd>
+          <div style="padding: 6px;">
+            <form id="flyout-search-form" class="wy-form" target="_blank" action="{{ relpath }}
+              {{ versions.branches.get(current_version) if versions.branches.get(current_version)
+              else versions.tags.get(current_version) }}/../search.html" method="get">
+              <input type="text" name="q" aria-label="Search docs" placeholder="Search docs">
+            </form>
+          </div>
+        </dd>
+      </dl>
+    </div>
+  </div>
+</div>"""
+
+
+class _UncachedVersions(_BranchTag):
+    """``versions`` resolving the paths of its branches/tags on every access, as before they were cached."""
+
+    def __init__(self, versions: BuiltVersions) -> None:
+        self.build_directory = versions.build_directory
+        self._tags = versions._tags
+        self._branches = versions._branches
+        return
+
+    pass
+
+
+def _versions(count: int, build_directory: str) -> BuiltVersions:
+    """``count`` versions, a tenth of them branches and the others tags."""
+    branches = [PseudoBranch(f"branch-{i}") for i in range(max(count // 10, 1))]
+    tags = [Ref(f"v{i // 10}.{i % 10}.0", "tag", None, None, i) for i in range(count - len(branches))]
+    return BuiltVersions(tags + branches, build_directory)
+
+
+def _pagenames(count: int) -> list:
+    """``count`` page names, nested up to three levels deep."""
+    return ["/".join([f"section{i % 3}"] * (i % 4) + [f"page{i}"]) if i else "index" for i in range(count)]
+
+
+def _render(pagenames: list, current_version: str) -> float:
+    """Render ``versions.html`` into every page of ``current_version``; returns the elapsed seconds."""
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader(TEMPLATES_DIR))
+    template = env.get_template("versions.html")
+    app = types.SimpleNamespace(config=types.SimpleNamespace(sv_project_url=None))
+
+    start = time.perf_counter()
+    EventHandlers.CURRENT_VERSION = current_version
+    # what `builder_inited` does once per build
+    EventHandlers._VERSIONS_FRAGMENT = VersionsFragment(EventHandlers.VERSIONS)
+    for pagename in pagenames:
+        context = {"sidebars": []}
+        EventHandlers.html_page_context(app, pagename, "page.html", context, None)
+        template.render(context)
+    return time.perf_counter() - start
+
+
+def _render_reference(pagenames: list, current_version: str) -> float:
+    """Render :data:`REFERENCE_TEMPLATE` into every page of ``current_version``, with the context the html
+    builder used to pass it; returns the elapsed seconds.
+    """
+    template = jinja2.Environment().from_string(REFERENCE_TEMPLATE)
+    versions = _UncachedVersions(EventHandlers.VERSIONS)
+
+    start = time.perf_counter()
+    for pagename in pagenames:
+        context = {
+            "current_version": current_version,
+            "project_url": None,
+            "versions": versions,
+            "floating_badge": False,
+            "relpath": pagename.count("/") * "../",
+        }
+        template.render(context)
+    return time.perf_counter() - start
+
+
+@app.command()
+def main(
+    pages: int = typer.Option(5000, "--pages", help="Number of pages of each version."),
+    versions: int = typer.Option(300, "--versions", help="Number of versions."),
+    builds: int = typer.Option(
+        3, "--builds", help="Number of versions to render; the total is extrapolated to all versions."
+    ),
+) -> None:
+    """Render the version selector menu of ``builds`` versions and extrapolate it to all ``versions``."""
+    pagenames = _pagenames(pages)
+    with tempfile.TemporaryDirectory() as build_directory:
+        EventHandlers.VERSIONS = _versions(versions, build_directory)
+        names = list(EventHandlers.VERSIONS.tags)[:builds]
+
+        for label, render in (("once per version", _render), ("every page", _render_reference)):
+            elapsed = sum(render(pagenames, x) for x in names) / len(names)
+            print(
+                f"{label:>16}: {elapsed:8.3f} s per version, {elapsed / pages * 1e6:8.1f} us per page, "
+                f"{elapsed * versions:10.1f} s for {pages} pages x {versions} versions"
+            )
+    return
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,269 @@
+"""Benchmark the whole pipeline of :class:`sphinx_versioned.build.VersionedDocs` on a synthetic repository.
+
+Generates a local git repository with ``--tags`` tags and ``--branches`` branches, whose docs have ``--pages``
+pages and document ``--modules`` python modules with autodoc. It is then built end to end, reporting the time
+spent in every phase: ref discovery, selection, checkout, sphinx read/write, copy and index generation; see
+:class:`sphinx_versioned.timing.Timings`.
+
+The results can be saved as a JSON baseline and compared against one, e.g. between two releases:
+
+    python benchmarks/bench_pipeline.py --tags 20 --pages 50 --save baseline.json
+    python benchmarks/bench_pipeline.py --tags 20 --pages 50 --compare baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import pathlib
+import platform
+import tempfile
+import statistics
+
+import git
+import sphinx
+import typer
+from loguru import logger as log
+
+from sphinx_versioned._version import __version__
+from sphinx_versioned.build import VersionedDocs
+from sphinx_versioned.versions import GitVersions
+
+app = typer.Typer(add_completion=False)
+
+CONF_PY = """\
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(".."))
+
+project = "benchmark"
+extensions = ["sphinx.ext.autodoc"]
+html_theme = "alabaster"
+"""
+
+PAGE_RST = """\
+Page {index}
+{underline}
+
+Section
+-------
+
+Lorem ipsum dolor sit amet, consectetur adipiscing elit, see :doc:`index` and :ref:`genindex`.
+
+.. code-block:: python
+
+   def page_{index}():
+       return {index}
+
+.. note::
+
+   Revision {revision}.
+"""
+
+MODULE_PY = '''\
+"""Module {index}."""
+
+
+class Class{index}:
+    """A class.
+
+    Parameters
+    ----------
+    value : int
+        A value.
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+    def method(self, other):
+        """Add ``other`` to the value."""
+        return self.value + other
+
+
+def function_{index}(x, y=1):
+    """Return ``x`` times ``y``."""
+    return x * y
+'''
+
+
+def _write(path: pathlib.Path, data: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(data, encoding="utf8")
+    return
+
+
+def generate_repo(path: pathlib.Path, tags: int, branches: int, pages: int, modules: int) -> None:
+    """Generate a git repository at ``path`` with one commit per tag, each changing one page.
+
+    The ``main`` branch points to the last commit; the other branches are spread over the history.
+    """
+    docs = path / "docs"
+    _write(docs / "conf.py", CONF_PY)
+    toctree = "\n".join([f"   pages/page{x}" for x in range(pages)] + (["   api"] if modules else []))
+    _write(docs / "index.rst", f"Benchmark\n=========\n\n.. toctree::\n   :maxdepth: 2\n\n{toctree}\n")
+    for x in range(pages):
+        _write(docs / "pages" / f"page{x}.rst", PAGE_RST.format(index=x, underline="=" * 20, revision=0))
+    if modules:
+        _write(path / "bench_pkg" / "__init__.py", "")
+        automodules = "\n".join(f".. automodule:: bench_pkg.mod{x}\n   :members:\n" for x in range(modules))
+        _write(docs / "api.rst", f"API\n===\n\n{automodules}")
+    for x in range(modules):
+        _write(path / "bench_pkg" / f"mod{x}.py", MODULE_PY.format(index=x))
+    _write(path / ".gitignore", "docs/_build/\n")
+
+    repo = git.Repo.init(path)
+    repo.git.checkout("-b", "main")
+    repo.git.add(".")
+    repo.git.commit("-q", "-m", "initial")
+
+    commits = []
+    for x in range(tags):
+        page = x % pages if pages else None
+        if page is not None:
+            _write(
+                docs / "pages" / f"page{page}.rst",
+                PAGE_RST.format(index=page, underline="=" * 20, revision=x + 1),
+            )
+            repo.git.add(".")
+        repo.git.commit("-q", "--allow-empty", "-m", f"revision {x + 1}")
+        repo.git.tag(f"v{x // 10}.{x % 10}.0")
+        commits.append(repo.head.commit.hexsha)
+
+    for x in range(branches):
+        commit = commits[x * len(commits) // branches] if commits else "HEAD"
+        repo.git.branch(f"branch-{x}", commit)
+    return
+
+
+def run(path: pathlib.Path, jobs: int, prebuild: bool, prebuild_mode: str, export: bool) -> dict:
+    """Build the repository at ``path`` from scratch; returns the seconds of every phase and ``total``."""
+    shutil.rmtree(path / "docs" / "_build", ignore_errors=True)
+    # measure the discovery of the refs, not the cache of a previous run
+    (path / ".git" / GitVersions.REFS_CACHE_FILENAME).unlink(missing_ok=True)
+
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        start = time.time()
+        docs = VersionedDocs(
+            {
+                "chdir": None,
+                "output_dir": "docs/_build",
+                "git_root": None,
+                "local_conf": "docs/conf.py",
+                "prebuild_branches": prebuild,
+                "prebuild_mode": prebuild_mode,
+                "export": export,
+                "select_branches": None,
+                "exclude_branches": None,
+                "main_branch": "main",
+                "quite": True,
+                "verbose": False,
+                "force_branches": False,
+                "jobs": jobs,
+            }
+        )
+        total = time.time() - start
+    finally:
+        os.chdir(cwd)
+
+    return {**docs.timings.totals(), "total": total}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Print the timings of ``results`` against ``baseline``; returns `False` if any phase regressed by more
+    than ``tolerance``, a fraction of the baseline, and by more than 50ms.
+    """
+    if results["params"] != baseline["params"]:
+        print(f"warning: baseline was run with {baseline['params']}")
+
+    ok = True
+    print(f"{'phase':>10} {'baseline':>10} {'current':>10} {'change':>8}")
+    for phase, current in results["timings"].items():
+        before = baseline["timings"].get(phase)
+        if before is None:
+            print(f"{phase:>10} {'-':>10} {current:10.3f}")
+            continue
+        change = (current - before) / before if before else 0
+        regressed = current - before > max(before * tolerance, 0.05)
+        ok = ok and not regressed
+        print(
+            f"{phase:>10} {before:10.3f} {current:10.3f} {change:+8.1%}{'  REGRESSED' if regressed else ''}"
+        )
+    return ok
+
+
+@app.command()
+def main(
+    tags: int = typer.Option(10, "--tags", help="Number of tags."),
+    branches: int = typer.Option(2, "--branches", help="Number of branches, besides `main`."),
+    pages: int = typer.Option(20, "--pages", help="Number of pages."),
+    modules: int = typer.Option(5, "--modules", help="Number of python modules documented with autodoc."),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Number of versions to build in parallel."),
+    prebuild: bool = typer.Option(True, help="Pre-build the versions."),
+    prebuild_mode: str = typer.Option("html", "--prebuild-mode", help="How to pre-build the versions."),
+    export: bool = typer.Option(False, "--export", help="Export the versions instead of checking them out."),
+    repeat: int = typer.Option(1, "--repeat", help="Number of runs; the median of every phase is reported."),
+    save: str = typer.Option(None, "--save", help="Save the results as a JSON baseline to this file."),
+    baseline: str = typer.Option(None, "--compare", help="Compare the results to this JSON baseline."),
+    tolerance: float = typer.Option(
+        0.2, "--tolerance", help="Allowed slowdown of every phase, see --compare."
+    ),
+) -> None:
+    """Build a synthetic repository end to end and report the time spent in every phase."""
+    log.remove()
+    log.add(sys.stderr, level="WARNING")
+
+    params = {
+        "tags": tags,
+        "branches": branches,
+        "pages": pages,
+        "modules": modules,
+        "jobs": jobs,
+        "prebuild": prebuild,
+        "prebuild_mode": prebuild_mode,
+        "export": export,
+    }
+    with tempfile.TemporaryDirectory() as path:
+        path = pathlib.Path(path)
+        start = time.time()
+        generate_repo(path, tags, branches, pages, modules)
+        print(f"generated repository in {time.time() - start:.1f}s: {params}")
+
+        runs = [run(path, jobs, prebuild, prebuild_mode, export) for _ in range(repeat)]
+
+    timings = {x: statistics.median(y.get(x, 0) for y in runs) for x in runs[0]}
+    results = {
+        "params": params,
+        "environment": {
+            "sphinx-versioned-docs": __version__,
+            "sphinx": sphinx.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "timings": timings,
+    }
+
+    if baseline:
+        with open(baseline, "r", encoding="utf8") as f:
+            ok = compare(results, json.load(f), tolerance)
+    else:
+        ok = True
+        for phase, seconds in timings.items():
+            print(f"{phase:>10} {seconds:10.3f}")
+
+    if save:
+        with open(save, "w", encoding="utf8") as f:
+            json.dump(results, f, indent=2)
+        print(f"saved results to {save}")
+
+    if not ok:
+        raise typer.Exit(1)
+    return
+
+
+if __name__ == "__main__":
+    app()
@@ -6,7 +6,9 @@ from loguru import logger as log
 
 from sphinx_versioned.build import VersionedDocs
 from sphinx_versioned.sphinx_ import EventHandlers
-from sphinx_versioned.lib import mp_sphinx_compatibility, parse_branch_selection
+from sphinx_versioned.publish import ContentStore, COMPRESS_FORMATS, brotli
+from sphinx_versioned.selection import parse_range
+from sphinx_versioned.lib import mp_sphinx_compatibility, parse_branch_selection, parse_size
 
 app = typer.Typer(add_completion=False)
 
@@ -45,12 +47,42 @@ def main(
     prebuild: bool = typer.Option(
         True, help="Pre-builds the documentations; Use `--no-prebuild` to half the runtime."
     ),
+    prebuild_mode: str = typer.Option(
+        "html",
+        "--prebuild-mode",
+        help="How to pre-build: `html` builds completely and re-uses the output, `dummy` only reads the "
+        "sources, `cached` skips the versions built before with the same content, config and toolchain.",
+    ),
+    retry_failed: bool = typer.Option(
+        False,
+        "--retry-failed",
+        help="Pre-build the versions which failed before, even if their content, config and toolchain are "
+        "unchanged.",
+    ),
     branches: str = typer.Option(
         None,
         "-b",
         "--branch",
         help="Build documentation for specific branches and tags.",
     ),
+    version_range: str = typer.Option(
+        None,
+        "--version-range",
+        help="Only build the branches/tags named like versions in this range, e.g. `>=2.0,<4`.",
+        show_default=False,
+    ),
+    latest_minors: int = typer.Option(
+        None,
+        "--latest-minors",
+        help="Only build the newest patch release of each of the N latest minor versions.",
+        show_default=False,
+    ),
+    latest_majors: int = typer.Option(
+        None,
+        "--latest-majors",
+        help="Only build the newest release of each of the N latest major versions.",
+        show_default=False,
+    ),
     main_branch: str = typer.Option(
         None,
         "-m",
@@ -78,6 +110,123 @@ def main(
         "--force",
         help="Force branch selection. Use this option to build detached head/commits. [Default: False]",
     ),
+    keep_going: bool = typer.Option(
+        False,
+        "--keep-going",
+        help="Keep building the other versions when one fails; publish the successful ones and exit with an "
+        "error.",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Resume an interrupted build: restore the working tree and skip the versions it already "
+        "finished.",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "-j",
+        "--jobs",
+        help="Number of versions to build in parallel, each in its own worker process and git worktree. "
+        "Use `0` for the number of CPUs.",
+    ),
+    sphinx_jobs: int = typer.Option(
+        1,
+        "--sphinx-jobs",
+        help="Number of processes sphinx reads/writes every version with, see `sphinx-build -j`. "
+        "Use `0` to share the CPUs evenly between the `--jobs` concurrent builds.",
+    ),
+    isolate: bool = typer.Option(
+        False,
+        "--isolate",
+        help="Build every version in a fresh worker process and git worktree, even without `--jobs`.",
+    ),
+    memory_limit: str = typer.Option(
+        None,
+        "--memory-limit",
+        help="Limit the memory of every worker process, e.g. `4G`; a version exceeding it fails to build.",
+        show_default=False,
+    ),
+    max_worker_builds: int = typer.Option(
+        None,
+        "--max-worker-builds",
+        help="Replace every worker process by a fresh one after building this many versions. "
+        "Default is 1 with `--isolate`, unlimited otherwise.",
+        show_default=False,
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Skip versions whose commit, config and toolchain are unchanged since the last build.",
+    ),
+    relink: bool = typer.Option(
+        False,
+        "--relink",
+        help="Build every version once with a placeholder menu, then fill in the list of versions in the "
+        "html files. Adding a version then doesn't re-build the others with `--incremental`.",
+    ),
+    versions_json: bool = typer.Option(
+        False,
+        "--versions-json",
+        help="Write the list of versions to a top-level `versions.json`, which the flyout menu fetches at "
+        "runtime, instead of rendering it into every page.",
+    ),
+    dedup: str = typer.Option(
+        None,
+        "--dedup",
+        help="Store identical files of all versions once in `<output>/.store` and link to them; "
+        "either `hardlink` or `reflink`.",
+        show_default=False,
+    ),
+    export: bool = typer.Option(
+        False,
+        "--export",
+        help="Export every version from the git object database instead of checking it out; "
+        "the working tree, index and HEAD are left untouched.",
+    ),
+    include: str = typer.Option(
+        None,
+        "--include",
+        help="Only check out/export these paths, relative to the repository root, for every version; "
+        "the directory of `conf.py` is always included. Applies to `--export` and `--jobs`.",
+        show_default=False,
+    ),
+    alias_refs: bool = typer.Option(
+        False,
+        "--alias-refs",
+        help="Build branches/tags pointing to identical git trees only once, and copy the output to the "
+        "others.",
+    ),
+    cache_dir: str = typer.Option(
+        None,
+        "--cache-dir",
+        help="Keep sphinx doctrees/environments per version in this directory across runs.",
+        show_default=False,
+    ),
+    compress: str = typer.Option(
+        None,
+        "--compress",
+        help="Write compressed copies of the html/js/css/json files next to them, to be served as is; "
+        "`gz`, `br` or both, e.g. `gz,br`. `br` requires the `brotli` package.",
+        show_default=False,
+    ),
+    compress_min_size: str = typer.Option(
+        "1K",
+        "--compress-min-size",
+        help="Don't compress files smaller than this, e.g. `1K`; see `--compress`.",
+    ),
+    report: str = typer.Option(
+        None,
+        "--report",
+        help="Write the time spent in every phase of every version, and the size of its output, to this "
+        "JSON file.",
+        show_default=False,
+    ),
+    trace: str = typer.Option(
+        None,
+        "--trace",
+        help="Write the timeline of the build to this file, in the Chrome trace format; open it in Perfetto.",
+        show_default=False,
+    ),
 ) -> None:
     """
     Typer application for initializing the ``sphinx-versioned`` build.
@@ -98,8 +247,19 @@ def main(
         Adds compatibility for older sphinx versions by monkey patching certain functions.
     prebuild : :class:`bool`
         Pre-builds the documentations; Use `--no-prebuild` to half the runtime. [Default = `True`]
+    prebuild_mode : :class:`str`
+        How to pre-build: ``html``, ``dummy`` or ``cached``. [Default = 'html']
+    retry_failed : :class:`bool`
+        Pre-build the versions which failed before with the same content, config and toolchain.
+        [Default = `False`]
     branches : :class:`str`
         Build docs for specific branches and tags. [Default = `None`]
+    version_range : :class:`str`
+        Only build the versions in this range, e.g. ``>=2.0,<4``. [Default = `None`]
+    latest_minors : :class:`int`
+        Only build the newest patch release of each of the N latest minor versions. [Default = `None`]
+    latest_majors : :class:`int`
+        Only build the newest release of each of the N latest major versions. [Default = `None`]
     main_branch : :class:`str`
         Main branch to which the top-level `index.html` redirects to. [Default = 'main']
     floating_badge : :class:`bool`
@@ -112,6 +272,48 @@ def main(
         Provide logging level. Example `--log` debug, [Default='info']
     force_branches : :class:`str`
         Force branch selection. Use this option to build detached head/commits. [Default = `False`]
+    keep_going : :class:`bool`
+        Keep building the other versions when one fails, and publish the successful ones. [Default = `False`]
+    resume : :class:`bool`
+        Resume an interrupted build, skipping the versions it already finished. [Default = `False`]
+    jobs : :class:`int`
+        Number of versions to build in parallel. Use `0` for the number of CPUs. [Default = `1`]
+    sphinx_jobs : :class:`int`
+        Number of processes sphinx reads/writes every version with. Use `0` to share the CPUs. [Default = `1`]
+    isolate : :class:`bool`
+        Build every version in a fresh worker process and git worktree, even without ``jobs``.
+        [Default = `False`]
+    memory_limit : :class:`str`
+        Limit the memory of every worker process, e.g. ``4G``. [Default = `None`]
+    max_worker_builds : :class:`int`
+        Replace every worker process by a fresh one after building this many versions; ``1`` with ``isolate``.
+        [Default = `None`]
+    incremental : :class:`bool`
+        Skip versions whose commit, config and toolchain are unchanged since the last build.
+        [Default = `False`]
+    relink : :class:`bool`
+        Fill in the list of versions of the flyout menu after building. [Default = `False`]
+    versions_json : :class:`bool`
+        Write the list of versions to a top-level ``versions.json`` fetched by the flyout menu.
+        [Default = `False`]
+    dedup : :class:`str`
+        De-duplicate identical files across versions with ``hardlink`` or ``reflink``. [Default = `None`]
+    export : :class:`bool`
+        Export every version from the git object database instead of checking it out. [Default = `False`]
+    include : :class:`str`
+        Only check out/export these paths for every version. [Default = `None`]
+    alias_refs : :class:`bool`
+        Build branches/tags pointing to identical git trees only once. [Default = `False`]
+    cache_dir : :class:`str`
+        Keep sphinx doctrees/environments per version in this directory across runs. [Default = `None`]
+    compress : :class:`str`
+        Write ``gz`` and/or ``br`` compressed copies of the text files next to them. [Default = `None`]
+    compress_min_size : :class:`str`
+        Don't compress files smaller than this, e.g. ``1K``. [Default = '1K']
+    report : :class:`str`
+        Write the time spent in every phase of every version to this JSON file. [Default = `None`]
+    trace : :class:`str`
+        Write the timeline of the build to this file, in the Chrome trace format. [Default = `None`]
 
     Returns
     -------
@@ -126,6 +328,8 @@ def main(
 
     EventHandlers.RESET_INTERSPHINX_MAPPING = reset_intersphinx_mapping
     EventHandlers.FLYOUT_FLOATING_BADGE = floating_badge
+    EventHandlers.RELINK = relink
+    EventHandlers.VERSIONS_JSON = versions_json
 
     if reset_intersphinx_mapping:
         log.warning("Forcing --no-prebuild")
@@ -134,6 +338,41 @@ def main(
     if sphinx_compatibility:
         mp_sphinx_compatibility()
 
+    if version_range:
+        try:
+            parse_range(version_range)
+        except ValueError as err:
+            raise typer.BadParameter(str(err), param_hint="--version-range")
+
+    if memory_limit:
+        try:
+            memory_limit = parse_size(memory_limit)
+        except ValueError as err:
+            raise typer.BadParameter(str(err), param_hint="--memory-limit")
+
+    if prebuild_mode not in VersionedDocs.PREBUILD_MODES:
+        raise typer.BadParameter(
+            f"expected one of {VersionedDocs.PREBUILD_MODES}", param_hint="--prebuild-mode"
+        )
+
+    if compress:
+        compress = [x for x in re.split(r"\s|,", compress) if x]
+        if any(x not in COMPRESS_FORMATS for x in compress):
+            raise typer.BadParameter(f"expected any of {COMPRESS_FORMATS}", param_hint="--compress")
+        if "br" in compress and brotli is None:
+            raise typer.BadParameter(
+                "`br` requires the `brotli` package, e.g. `pip install sphinx-versioned-docs[compress]`",
+                param_hint="--compress",
+            )
+
+    try:
+        compress_min_size = parse_size(compress_min_size)
+    except ValueError as err:
+        raise typer.BadParameter(str(err), param_hint="--compress-min-size")
+
+    if dedup and dedup not in ContentStore.MODES:
+        raise typer.BadParameter(f"expected one of {ContentStore.MODES}", param_hint="--dedup")
+
     return VersionedDocs(
         {
             "chdir": chdir,
@@ -141,12 +380,35 @@ def main(
             "git_root": git_root,
             "local_conf": local_conf,
             "prebuild_branches": prebuild,
+            "prebuild_mode": prebuild_mode,
+            "retry_failed": retry_failed,
             "select_branches": select_branches,
             "exclude_branches": exclude_branches,
+            "version_range": version_range,
+            "latest_minors": latest_minors,
+            "latest_majors": latest_majors,
             "main_branch": main_branch,
             "quite": quite,
             "verbose": verbose,
             "force_branches": force_branches,
+            "keep_going": keep_going,
+            "resume": resume,
+            "jobs": jobs,
+            "sphinx_jobs": sphinx_jobs,
+            "isolate": isolate,
+            "memory_limit": memory_limit,
+            "max_worker_builds": max_worker_builds,
+            "incremental": incremental,
+            "cache_dir": cache_dir,
+            "dedup": dedup,
+            "alias_refs": alias_refs,
+            "export": export,
+            "include_paths": [x for x in re.split(r"\s|,", include) if x] if include else None,
+            "sphinx_compatibility": sphinx_compatibility,
+            "compress": compress,
+            "compress_min_size": compress_min_size,
+            "report": report,
+            "trace": trace,
         }
     )
 
@@ -0,0 +1,40 @@
+// Fill in the list of versions from `versions.json`, which is written with `--versions-json`.
+function renderVersionsJson() {
+    let requests = {}
+
+    Array.from(document.getElementsByClassName("sv-versions")).forEach(element => {
+        let url = new URL(element.dataset.versions, document.baseURI).href
+        if (!(url in requests)) {
+            requests[url] = fetch(url).then(response => response.json())
+        }
+
+        requests[url].then(versions => {
+            [["Tags", versions.tags], ["Branches", versions.branches]].forEach(([title, entries]) => {
+                if (!entries || !Object.keys(entries).length) {
+                    return
+                }
+                let dl = document.createElement("dl")
+                let dt = document.createElement("dt")
+                dt.textContent = title
+                dl.appendChild(dt)
+
+                Object.entries(entries).forEach(([name, path]) => {
+                    let dd = document.createElement("dd")
+                    if (name == element.dataset.currentVersion) {
+                        dd.className = "rtd-current-item"
+                    }
+                    let a = document.createElement("a")
+                    a.href = new URL(path, url).href
+                    a.textContent = name
+                    dd.appendChild(a)
+                    dl.appendChild(dd)
+                })
+                element.appendChild(dl)
+            })
+        }).catch(error => console.error(`sphinx-versioned: failed to load ${url}`, error))
+    })
+}
+
+window.addEventListener("DOMContentLoaded", (event) => {
+    renderVersionsJson()
+});
@@ -1,7 +1,12 @@
 import os
-import fnmatch
+import json
 import shutil
 import pathlib
+import contextlib
+import multiprocessing
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from sphinx import application
 from sphinx.errors import SphinxError
 from sphinx.cmd.build import build_main
@@ -9,8 +14,162 @@ from sphinx.cmd.build import build_main
 from loguru import logger as log
 
 from sphinx_versioned.sphinx_ import EventHandlers
-from sphinx_versioned.lib import TempDir, ConfigInject
-from sphinx_versioned.versions import GitVersions, BuiltVersions, PseudoBranch
+from sphinx_versioned.lib import TempDir, ConfigInject, mp_sphinx_compatibility, limit_memory, peak_rss
+from sphinx_versioned.relink import Relinker
+from sphinx_versioned.timing import TIMINGS
+from sphinx_versioned.schedule import BuildHistory, schedule, balance, expected_durations
+from sphinx_versioned.selection import VersionSelector
+from sphinx_versioned.publish import sync_tree, compress_tree, ContentStore
+from sphinx_versioned.manifest import BuildManifest, fingerprint
+from sphinx_versioned.journal import BuildJournal
+from sphinx_versioned.versions import GitVersions, BuiltVersions, PseudoBranch, IsolatedCheckout, WorktreePool
+
+
+def _publish(
+    name: str, source: str, output_dir: pathlib.Path, nested: tuple = (), siblings: tuple = ()
+) -> None:
+    """Sync the html output of ``name`` from ``source`` to ``output_dir / name``, leaving the versions
+    ``nested`` inside it, and the compressed ``siblings`` of its files, untouched.
+    See :func:`sphinx_versioned.publish.sync_tree`.
+
+    With :attr:`~sphinx_versioned.sphinx_.EventHandlers.RELINK`, the list of versions is filled into the
+    staged output first, so that the files which did not change keep their modification times.
+    """
+    output_with_tag = output_dir / name
+    if not output_with_tag.exists():
+        output_with_tag.mkdir(parents=True, exist_ok=True)
+
+    if EventHandlers.RELINK and not EventHandlers.VERSIONS_JSON:
+        with TIMINGS.span("relink", name):
+            Relinker(output_dir, EventHandlers.VERSIONS).rewrite(source, name)
+
+    with TIMINGS.span("copy", name):
+        sync_tree(source, output_with_tag, nested, siblings=siblings)
+    return
+
+
+def _sphinx_build(
+    name: str,
+    source: str,
+    output_dir: pathlib.Path,
+    args: tuple,
+    _prebuild: bool,
+    doctree_dir: pathlib.Path = None,
+    html_dir: pathlib.Path = None,
+    nested: tuple = (),
+    siblings: tuple = (),
+) -> bool:
+    """Run ``sphinx-build`` for ``source`` inside a temporary directory and, if it's not a pre-build,
+    copy the result to ``output_dir / name``.
+
+    If ``doctree_dir`` is given, sphinx keeps its pickled environment and doctrees there instead of
+    inside the temporary directory; a later build re-uses them and only re-reads the changed sources.
+    If ``html_dir`` is given, the html output is written there and kept, instead of a temporary directory.
+    ``nested`` are the paths of other versions inside ``output_dir / name``, which are kept when publishing,
+    as are the compressed ``siblings`` of the published files; see :func:`_publish`.
+
+    Raises :class:`sphinx.errors.SphinxError` if the build fails.
+    """
+    with contextlib.nullcontext(str(html_dir)) if html_dir else TempDir() as temp_dir:
+        log.debug(f"Checking out the tag in temporary directory: {temp_dir}")
+        argv = (source, temp_dir)
+        argv += args
+        argv += ("-d", str(doctree_dir)) if doctree_dir else ()
+        result = build_main(argv)
+        if result != 0:
+            raise SphinxError(f"sphinx-build exited with status {result}")
+
+        if _prebuild:
+            log.success(f"pre-build succeded for {name} :)")
+            return True
+
+        _publish(name, temp_dir, output_dir, nested, siblings)
+        log.success(f"build succeded for {name} ;)")
+        return True
+
+
+# Lock shared by the worker processes of a parallel build, set by `_init_worker`.
+_worktree_lock = None
+
+
+def _init_worker(state: dict) -> None:
+    """Initializer for the worker processes of a parallel build.
+
+    Worker processes may be spawned rather than forked, so the class-level state of
+    :class:`~sphinx_versioned.sphinx_.EventHandlers` and the sphinx monkeypatches are re-applied
+    explicitly instead of being inherited from the parent process.
+    """
+    global _worktree_lock
+    _worktree_lock = state["worktree_lock"]
+
+    if state["memory_limit"]:
+        limit_memory(state["memory_limit"])
+
+    for attr, value in state["event_handlers"].items():
+        setattr(EventHandlers, attr, value)
+    EventHandlers.ASSETS_TO_COPY = set()
+
+    if state["sphinx_compatibility"]:
+        mp_sphinx_compatibility()
+
+    application.Config = ConfigInject
+    return
+
+
+def _build_isolated(job: dict) -> tuple:
+    """Worker-process entry point; builds one version inside its own
+    :class:`~sphinx_versioned.versions.IsolatedCheckout`.
+
+    Returns
+    -------
+    name, success, rss, error : :class:`str`, :class:`bool`, :class:`int`, :class:`str`
+        ``rss`` is the peak resident set size of the worker process after the build, see
+        :func:`sphinx_versioned.lib.peak_rss`; ``error`` is the reason of a failed build.
+    """
+    name = job["name"]
+    EventHandlers.CURRENT_VERSION = name
+    TIMINGS.stage = "prebuild" if job["prebuild"] else "build"
+    with contextlib.ExitStack() as stack:
+        with TIMINGS.span("checkout", name):
+            worktree = stack.enter_context(
+                IsolatedCheckout(
+                    job["git_root"], name, _worktree_lock, job["worktree"], job["export"], job["paths"]
+                )
+            )
+        source = str(worktree / job["source"])
+        error = None
+        try:
+            success = _sphinx_build(
+                name,
+                source,
+                job["output_dir"],
+                job["args"],
+                job["prebuild"],
+                job["doctree_dir"],
+                job["html_dir"],
+                job["nested"],
+                job["siblings"],
+            )
+        except SphinxError as err:
+            success, error = False, str(err)
+        except MemoryError:
+            log.error(f"{name} ran out of memory")
+            success, error = False, "out of memory"
+        return name, success, peak_rss(), error
+
+
+def _build_batch(jobs: list) -> list:
+    """Worker-process entry point; builds several versions one after another, see :func:`_build_isolated`.
+
+    Returns
+    -------
+    results, spans : :class:`list`, :class:`list`
+        ``(name, success, rss, error)`` of every version, and the spans recorded while building them, see
+        :class:`~sphinx_versioned.timing.Timings`.
+    """
+    mark = len(TIMINGS.spans)
+    results = [_build_isolated(x) for x in jobs]
+    return results, TIMINGS.spans[mark:]
 
 
 class VersionedDocs:
@@ -25,22 +184,106 @@ class VersionedDocs:
     Parameters
     ----------
     config : :class:`dict`
+
+    Attributes
+    ----------
+    failures : :class:`dict`
+        Versions which failed to build, mapped to the ``stage`` they failed in, ``prebuild`` or ``build``,
+        and the ``error``.
     """
 
+    # How versions are pre-built: `html` builds them completely, and the output is re-used by the build;
+    # `dummy` only reads them, with sphinx's `dummy` builder, and the build re-uses their environments;
+    # `cached` assumes the versions built before with the same content, config and toolchain still build,
+    # and reads the others like `dummy`.
+    PREBUILD_MODES = ("html", "dummy", "cached")
+
+    # Options which may be omitted from ``config``.
+    _CONFIG_DEFAULTS = {
+        "prebuild_mode": "html",
+        "retry_failed": False,
+        "compress": None,
+        "compress_min_size": 1024,
+        "keep_going": False,
+        "resume": False,
+        "jobs": 1,
+        "sphinx_compatibility": False,
+        "incremental": False,
+        "cache_dir": None,
+        "dedup": None,
+        "alias_refs": False,
+        "export": False,
+        "include_paths": None,
+        "version_range": None,
+        "latest_minors": None,
+        "latest_majors": None,
+        "report": None,
+        "trace": None,
+        "isolate": False,
+        "memory_limit": None,
+        "max_worker_builds": None,
+        "sphinx_jobs": 1,
+    }
+    # Options which do not change the generated docs; ignored when fingerprinting the config.
+    _VOLATILE_CONFIG = (
+        "chdir",
+        "prebuild_branches",
+        "prebuild_mode",
+        "retry_failed",
+        "select_branches",
+        "exclude_branches",
+        "version_range",
+        "latest_minors",
+        "latest_majors",
+        "main_branch",
+        "quite",
+        "verbose",
+        "force_branches",
+        "keep_going",
+        "resume",
+        "jobs",
+        "incremental",
+        "cache_dir",
+        "dedup",
+        "alias_refs",
+        "export",
+        "report",
+        "trace",
+        "compress",
+        "compress_min_size",
+        "isolate",
+        "memory_limit",
+        "max_worker_builds",
+        "sphinx_jobs",
+    )
+
     def __init__(self, config: dict, debug: bool = False) -> None:
+        # Time spent in every phase of the build, see `Timings.totals`
+        self.timings = TIMINGS
+        self.timings.clear()
+
         self.config = config
         self._parse_config(config)
         self._handle_paths()
 
+        # Journal of this run, or of an interrupted one to resume
+        self._journal = BuildJournal(self.output_dir)
+        self._restore_checkout()
+
         self._versions_to_pre_build = []
         self._versions_to_build = []
         self._failed_build = []
+        self._errors = {}
+        self.failures = {}
+        self._peak_rss = {}
+        self._process_rss = {}
 
         # Get all versions and make a lookup table
         self._all_branches = self.versions.all_versions
         self._lookup_branch = {x.name: x for x in self._all_branches}
 
-        self._select_exclude_branches()
+        with self.timings.span("selection"):
+            self._select_exclude_branches()
 
         # if `--force` is supplied with no `--main-branch`, make the `_active_branch` as the `main_branch`
         if not self.main_branch:
@@ -52,28 +295,348 @@ class VersionedDocs:
         if debug:
             return
 
-        self.prebuild()
+        self._load_manifest()
+        # kept out of the git directory, which may be read-only or shared by several checkouts
+        self._history = BuildHistory(self.cache_dir or self.output_dir)
+        self._root_published = False
 
         # Adds our extension to the sphinx-config
         application.Config = ConfigInject
 
+        self._start_journal()
+
+        # Worktrees for parallel builds, kept across runs in `cache_dir`
+        self._pool = WorktreePool(
+            self._git_root, (self.cache_dir or pathlib.Path(self._scratch.name)) / "worktrees", self.jobs
+        )
+
+        self.prebuild()
+
         self.build()
+        self.timings.stage = None
+
+        if EventHandlers.VERSIONS_JSON:
+            with self.timings.span("index"):
+                self._generate_versions_json()
+        elif EventHandlers.RELINK or len(self._built_version) != len(self._versions_to_build):
+            # with `keep_going`, the versions which failed to build are dropped from the flyout menu
+            with self.timings.span("relink"):
+                self.relink()
+
+        if self.dedup:
+            with self.timings.span("dedup"):
+                ContentStore(self.output_dir, self.dedup).dedup(
+                    [self.output_dir / x.name for x in self._built_version]
+                )
+
+        if self._workers and not self.export:
+            self._pool.prune()
+        self._scratch.cleanup()
+        self.versions.prune_worktrees()
 
         # Adds a top-level `index.html` in `output_dir` which redirects to `output_dir`/`main-branch`/index.html
-        self._generate_top_level_index()
+        with self.timings.span("index"):
+            self._generate_top_level_index()
+
+        if self.compress:
+            with self.timings.span("compress"):
+                compress_tree(self.output_dir, self.compress, self.compress_min_size)
+        self.timings.summary()
+        self._write_report()
 
         print(f"\n\033[92m Successfully built {', '.join([x.name for x in self._built_version])} \033[0m")
+        if self.failures:
+            self._failure_summary()
+        if len(self._built_version) != len(self._versions_to_build):
+            # the journal is kept, so that `--resume` only retries the versions which failed
+            exit(-1)
+        self._journal.finish()
         return
 
     def _parse_config(self, config: dict) -> bool:
-        for varname, value in config.items():
+        for varname, value in {**self._CONFIG_DEFAULTS, **config}.items():
             setattr(self, varname, value)
 
+        if not self.jobs or self.jobs < 1:
+            self.jobs = os.cpu_count() or 1
+
+        # build in worker processes, instead of the current process
+        self._workers = self.jobs > 1 or self.isolate
+        if (self.memory_limit or self.max_worker_builds) and not self._workers:
+            log.warning("memory limits and worker recycling only apply to `--isolate` and `--jobs`")
+
+        self._budget_sphinx_jobs()
+
         self._additional_args = ()
         self._additional_args += ("-Q",) if self.quite else ()
         self._additional_args += ("-vv",) if self.verbose else ()
+        self._additional_args += ("-j", str(self.sphinx_jobs)) if self.sphinx_jobs > 1 else ()
+
+        # compressed files kept along the published files, see `compress_tree`
+        self._siblings = tuple(f".{x}" for x in self.compress) if self.compress else ()
         return True
 
+    def _budget_sphinx_jobs(self) -> None:
+        """Share the CPUs between the ``jobs`` concurrent version builds and the ``sphinx_jobs`` processes
+        each of them runs sphinx with, see ``sphinx-build -j``.
+
+        ``sphinx_jobs`` of ``0`` gives every build an equal share of the CPUs; more processes than CPUs in
+        total only add memory and context switches, so it's warned about.
+        """
+        cpus = os.cpu_count() or 1
+        if not self.sphinx_jobs or self.sphinx_jobs < 1:
+            self.sphinx_jobs = max(cpus // self.jobs, 1)
+        elif self.jobs * self.sphinx_jobs > cpus:
+            log.warning(
+                f"{self.jobs} jobs with {self.sphinx_jobs} sphinx jobs each run more processes "
+                f"than the {cpus} CPUs"
+            )
+        log.debug(f"sphinx jobs per build: {self.sphinx_jobs}")
+        return
+
+    def _load_manifest(self) -> None:
+        """Load the :class:`~sphinx_versioned.manifest.BuildManifest` from the output directory and
+        fingerprint the build configuration for incremental builds.
+        """
+        self.manifest = BuildManifest(self.output_dir)
+        self._toolchain_key = fingerprint(self.manifest.toolchain)
+        self._prebuild_failed = {}
+        self._hexsha = {}
+        self._versions_key = None
+        self._config_key = fingerprint(
+            {
+                "config": {x: y for x, y in self.config.items() if x not in self._VOLATILE_CONFIG},
+                "reset_intersphinx_mapping": EventHandlers.RESET_INTERSPHINX_MAPPING,
+                "floating_badge": EventHandlers.FLYOUT_FLOATING_BADGE,
+                "relink": EventHandlers.RELINK,
+                "versions_json": EventHandlers.VERSIONS_JSON,
+            }
+        )
+        return
+
+    def _restore_checkout(self) -> None:
+        """Check out the ref the working tree was on before an interrupted run changed it, with ``resume``,
+        and discover the refs again from there.
+        """
+        ref = self._journal.checkout
+        if not ref:
+            return
+
+        if not self.resume:
+            log.warning(
+                f"an interrupted build left the working tree checked out; use `--resume` to restore `{ref}`"
+            )
+            return
+
+        log.info(f"restoring the working tree to `{ref}`")
+        self.versions.repo.git.checkout(ref)
+        self._journal.record_checkout(None)
+        # the refs were discovered on the detached head of the interrupted run, e.g. a `PseudoBranch`
+        # with `force`
+        with self.timings.span("refs"):
+            self.versions._parse_branches()
+        return
+
+    def _start_journal(self) -> None:
+        """Start the :class:`~sphinx_versioned.journal.BuildJournal` of this run and the scratch space for the
+        output of pre-builds, which is re-used by the build.
+
+        With ``resume``, the journal of an interrupted run with the same configuration and commits is
+        continued instead; the versions it pre-built or published are skipped, and its scratch space is
+        re-used if it still exists. Otherwise the scratch space an interrupted run left behind is removed.
+        """
+        key = fingerprint(
+            {
+                "config": self._config_key,
+                "prebuild": self.prebuild_branches,
+                "versions": {x.name: self.versions.hexsha(x.name) for x in self._versions_to_pre_build},
+            }
+        )
+        scratch = (
+            self._journal.scratch if self._journal.scratch and os.path.isdir(self._journal.scratch) else None
+        )
+
+        if self.resume and self._journal.key == key:
+            log.info(
+                f"resuming the interrupted build: {len(self._journal.prebuilt)} versions pre-built, "
+                f"{len(self._journal.published)} published"
+            )
+            self._scratch = TempDir(path=scratch)
+            self._journal.scratch = self._scratch.name
+            self._journal.save()
+            return
+
+        if self.resume:
+            log.warning("no interrupted build with the same configuration and commits; building from scratch")
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+        self._scratch = TempDir()
+        self._journal.start(key, self._scratch.name)
+        return
+
+    def _cache_path(self, name: str, kind: str) -> pathlib.Path:
+        """Path of the per-version cache entry ``kind``, or `None` if no ``cache_dir`` is configured.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            Name of the branch/tag.
+        kind : :class:`str`
+            Kind of cache entry, e.g. ``doctrees``.
+
+        Returns
+        -------
+        :class:`pathlib.Path`
+        """
+        if not self.cache_dir:
+            return None
+        # branch names may contain `/`; keep one flat directory per version
+        return self.cache_dir / quote(name, safe="") / kind
+
+    def _scratch_path(self, name: str, kind: str) -> pathlib.Path:
+        """Path of the per-version entry ``kind`` in the scratch space of this run.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            Name of the branch/tag.
+        kind : :class:`str`
+            Kind of entry, e.g. ``html``.
+
+        Returns
+        -------
+        :class:`pathlib.Path`
+        """
+        return pathlib.Path(self._scratch.name) / quote(name, safe="") / kind
+
+    def _sphinx_args(self, _prebuild: bool) -> tuple:
+        """Arguments to ``sphinx-build`` for a build, or a pre-build with ``prebuild_mode``."""
+        if _prebuild and self.prebuild_mode != "html":
+            return self._additional_args + ("-b", "dummy")
+        return self._additional_args
+
+    def _prebuild_html_dir(self, name: str, _prebuild: bool) -> pathlib.Path:
+        """Where the html output of the pre-build of ``name`` is kept for the build, if there's any."""
+        if _prebuild and self.prebuild_mode == "html":
+            return self._scratch_path(name, "html")
+        return None
+
+    def _build_key(self, tag) -> str:
+        """Fingerprint of the content, configuration and toolchain ``tag`` is built with, see
+        :attr:`sphinx_versioned.schedule.BuildHistory.built` and
+        :attr:`~sphinx_versioned.schedule.BuildHistory.failed`.
+
+        The content is the git tree, restricted to ``include_paths``; it includes ``conf.py``, and unlike the
+        commit it does not change when the same content is committed again, e.g. rebased.
+        """
+        return fingerprint(
+            {
+                "tree": self.versions.tree(tag.name, self._include),
+                "config": self._config_key,
+                "toolchain": self._toolchain_key,
+            }
+        )
+
+    def _doctree_dir(self, name: str) -> pathlib.Path:
+        """Doctree directory of ``name``; in ``cache_dir``, if configured, otherwise in the scratch space."""
+        return self._cache_path(name, "doctrees") or self._scratch_path(name, "doctrees")
+
+    def _export_path(self, name: str) -> pathlib.Path:
+        """Location of the exported tree of ``name``; in ``cache_dir``, if configured, otherwise in the
+        scratch space. See :func:`~sphinx_versioned.versions.export_tree`.
+        """
+        return self._cache_path(name, "export") or self._scratch_path(name, "export")
+
+    def _nested(self, name: str) -> tuple:
+        """Paths, relative to the output of ``name``, of other versions nested inside it; e.g. ``x`` for
+        the branch ``feature/x`` inside the branch ``feature``.
+        """
+        prefix = f"{name}/"
+        return tuple(x[len(prefix) :] for x in self._lookup_branch if x.startswith(prefix))
+
+    def _version_key(self, tag) -> dict:
+        """Key of ``tag`` in the :class:`~sphinx_versioned.manifest.BuildManifest`."""
+        if tag.name not in self._hexsha:
+            self._hexsha[tag.name] = self.versions.hexsha(tag.name)
+        return self.manifest.key(self._hexsha[tag.name], self._config_key, self._versions_key)
+
+    def _outdated(self, versions: list, fields: tuple = None) -> list:
+        """Filter out the versions which are up-to-date in the output directory.
+
+        Returns ``versions`` as is, unless ``incremental`` is set.
+
+        Parameters
+        ----------
+        versions : :class:`list`
+            Branches/tags to check.
+        fields : :class:`tuple`
+            Fields of the key to compare, see :meth:`~sphinx_versioned.manifest.BuildManifest.is_current`.
+
+        Returns
+        -------
+        :class:`list`
+        """
+        if not self.incremental:
+            return versions
+
+        outdated = []
+        for tag in versions:
+            if self.manifest.is_current(tag.name, self._version_key(tag), fields):
+                log.info(f"up-to-date, skipping: {tag}")
+                continue
+            outdated.append(tag)
+        return outdated
+
+    def _aliases(self, versions: list) -> dict:
+        """Find the versions pointing to the same git tree, i.e. the same content, as another version.
+
+        Returns an empty :class:`dict`, unless ``alias_refs`` is set.
+
+        Parameters
+        ----------
+        versions : :class:`list`
+            Branches/tags to check.
+
+        Returns
+        -------
+        :class:`dict`
+            Mapping of the name of every alias to the name of the first version in ``versions`` with its tree.
+        """
+        if not self.alias_refs:
+            return {}
+
+        trees = {}
+        aliases = {}
+        for tag in versions:
+            tree = self.versions.tree(tag.name, self._include)
+            if tree is None:
+                continue
+            if tree in trees:
+                log.info(f"{tag} has the same content as {trees[tree]}")
+                aliases[tag.name] = trees[tree]
+            else:
+                trees[tree] = tag.name
+        return aliases
+
+    def _clone(self, name: str, source: str) -> None:
+        """Publish the output of ``source`` as the output of ``name``, its alias.
+
+        The copy is staged in the scratch space and turned into pages of ``name`` there, see
+        :meth:`sphinx_versioned.relink.Relinker.rewrite`; so that unchanged files keep their modification
+        times in the output directory.
+        """
+        staged = self._scratch_path(name, "alias")
+        sync_tree(self.output_dir / source, staged, self._nested(source) + self._nested(name))
+
+        relinker = Relinker(
+            self.output_dir, EventHandlers.VERSIONS, versions_json=EventHandlers.VERSIONS_JSON
+        )
+        relinker.rewrite(staged, name)
+
+        _publish(name, staged, self.output_dir, self._nested(name), self._siblings)
+        log.success(f"published build of {source} for {name}")
+        return
+
     def _handle_paths(self) -> None:
         """Method to handle cwd and path for local config, as well as, configure
         :class:`~sphinx_versioned.versions.GitVersions` and the output directory.
@@ -81,7 +644,12 @@ class VersionedDocs:
         self.chdir = self.chdir if self.chdir else os.getcwd()
         log.debug(f"Working directory {self.chdir}")
 
-        self.versions = GitVersions(self.git_root, self.output_dir, self.force_branches)
+        if self.cache_dir:
+            self.cache_dir = pathlib.Path(self.cache_dir).resolve()
+            log.debug(f"Cache directory {self.cache_dir}")
+
+        with self.timings.span("refs"):
+            self.versions = GitVersions(self.git_root, self.output_dir, self.force_branches, self.cache_dir)
         self.output_dir = pathlib.Path(self.output_dir)
         self.local_conf = pathlib.Path(self.local_conf)
 
@@ -93,53 +661,66 @@ class VersionedDocs:
             raise FileNotFoundError(f"conf.py not found at {self.local_conf.parent}")
 
         log.success(f"located conf.py")
-        return
-
-    def _select_branches(self) -> None:
-        if not self.select_branches:
-            self._versions_to_pre_build = self._all_branches
-            return
 
-        for tag in self.select_branches:
-            filtered_tags = fnmatch.filter(self._lookup_branch.keys(), tag)
-            if filtered_tags:
-                self._versions_to_pre_build.extend([self._lookup_branch.get(x) for x in filtered_tags])
-            elif self.force_branches:
-                log.warning(f"Forcing build for branch `{tag}`, be careful, it may or may not exist!")
-                self._versions_to_pre_build.append(PseudoBranch(tag))
-            else:
-                log.critical(f"Branch not found/selected: `{tag}`, use `--force` to force the build")
-
-        return
-
-    def _exclude_branches(self) -> None:
-        if not self.exclude_branches:
-            return
+        # Source directory relative to the repository root, for building inside isolated checkouts.
+        self._git_root = pathlib.Path(self.versions.repo.working_tree_dir).resolve()
+        self._source = self.local_conf.parent.resolve().relative_to(self._git_root)
 
-        _names_versions_to_pre_build = [x.name for x in self._versions_to_pre_build]
-        for tag in self.exclude_branches:
-            filtered_tags = fnmatch.filter(_names_versions_to_pre_build, tag)
-            for x in filtered_tags:
-                self._versions_to_pre_build.remove(self._lookup_branch.get(x))
+        # Paths to check out in isolated checkouts; the directory of `conf.py` is always included.
+        self._include = None
+        if self.include_paths:
+            include = set(pathlib.PurePath(x).as_posix().strip("/") for x in self.include_paths)
+            include.add(self._source.as_posix())
+            self._include = None if include & {"", "."} else sorted(include)
+            log.debug(f"Include paths {self._include}")
 
+            if not self._workers and not self.export:
+                log.warning(
+                    "include paths only apply to `--export`, `--isolate` and `--jobs`; "
+                    "checking out the whole tree"
+                )
         return
 
     def _select_exclude_branches(self) -> list:
+        """Select the branches/tags to build with a :class:`~sphinx_versioned.selection.VersionSelector`."""
         log.debug(f"Instructions to select: `{self.select_branches}`")
         log.debug(f"Instructions to exclude: `{self.exclude_branches}`")
-        self._versions_to_pre_build = []
 
-        self._select_branches()
-        self._exclude_branches()
+        selector = VersionSelector(
+            self.select_branches,
+            self.exclude_branches,
+            self.version_range,
+            self.latest_minors,
+            self.latest_majors,
+        )
+        self._versions_to_pre_build = [
+            self._lookup_branch[x] for x in selector.select(list(self._lookup_branch))
+        ]
+
+        for tag in selector.missing:
+            if not self.force_branches:
+                log.critical(f"Branch not found/selected: `{tag}`, use `--force` to force the build")
+            elif not selector.excluded(tag):
+                log.warning(f"Forcing build for branch `{tag}`, be careful, it may or may not exist!")
+                self._versions_to_pre_build.append(PseudoBranch(tag))
 
         log.info(f"selected branches: `{[x.name for x in self._versions_to_pre_build]}`")
         return
 
-    def _generate_top_level_index(self) -> None:
+    def _generate_top_level_index(self, built: list = None) -> None:
         """Generate a top-level ``index.html`` which redirects to the main-branch version specified
-        via ``main_branch``.
+        via ``main_branch``; once, as soon as the main branch is published, see :meth:`_on_built`.
+
+        Parameters
+        ----------
+        built : :class:`list`
+            Names of the published versions. Default is all the built versions.
         """
-        if self.main_branch not in [x.name for x in self._built_version]:
+        if self._root_published:
+            return
+
+        built = built if built is not None else [x.name for x in self._built_version]
+        if self.main_branch not in built:
             log.critical(
                 f"main branch `{self.main_branch}` not found!! / not building `{self.main_branch}`; "
                 "top-level `index.html` will not be generated!"
@@ -158,6 +739,94 @@ class VersionedDocs:
                 </head>
             """
             )
+        self._root_published = True
+        return
+
+    def _on_built(self, name: str, success: bool, _prebuild: bool = False) -> None:
+        """Called as soon as ``name`` is pre-built, or built and published; records it in the journal and
+        publishes the top-level ``index.html`` once the main branch is.
+        """
+        if _prebuild:
+            self._journal.record_prebuild(name, success)
+            return
+
+        if success:
+            self._journal.record_publish(name)
+        if success and name == self.main_branch:
+            self._generate_top_level_index([name])
+        return
+
+    def _schedule(self, versions: list) -> list:
+        """Order ``versions`` to build: the main branch first, then the longest ones on previous runs first.
+        See :func:`sphinx_versioned.schedule.schedule`.
+        """
+        lookup = {x.name: x for x in versions}
+        return [lookup[x] for x in schedule(list(lookup), self.main_branch, self._history.durations)]
+
+    def _generate_versions_json(self) -> None:
+        """Generate a top-level ``versions.json`` listing the built versions, which the versions flyout menu
+        fetches at runtime. The file is only rewritten if the list changed.
+        """
+        versions = BuiltVersions(self._built_version, self.versions.build_directory).as_dict()
+        data = json.dumps(versions, indent=2)
+
+        path = self.output_dir / "versions.json"
+        if path.is_file() and path.read_text(encoding="utf8") == data:
+            log.debug("`versions.json` is up-to-date")
+            return
+
+        log.success("generating top-level `versions.json`")
+        path.write_text(data, encoding="utf8")
+        return
+
+    def _failed(self, tag, stage: str) -> None:
+        """Record the failure of ``tag`` in ``stage``, with the error of its build, see :attr:`failures`."""
+        self._failed_build.append(tag)
+        self.failures[tag.name] = {"stage": stage, "error": self._errors.get(tag.name) or "build failed"}
+        return
+
+    def _failure_summary(self) -> None:
+        """Log the versions which failed to build, the stage they failed in and why."""
+        width = max(len(x) for x in self.failures)
+        lines = "\n".join(f"  {x:<{width}}  {y['stage']:<8}  {y['error']}" for x, y in self.failures.items())
+        log.error(f"{len(self.failures)} versions failed to build:\n{lines}")
+        return
+
+    def _output_stats(self, name: str) -> dict:
+        """Number of ``bytes`` and html ``pages`` in the output of ``name``, without nested versions."""
+        root = self.output_dir / name
+        nested = set(self._nested(name))
+        stats = {"bytes": 0, "pages": 0}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                x for x in dirnames if (pathlib.Path(dirpath) / x).relative_to(root).as_posix() not in nested
+            ]
+            for filename in filenames:
+                stats["bytes"] += os.path.getsize(os.path.join(dirpath, filename))
+                stats["pages"] += filename.endswith(".html")
+        return stats
+
+    def _write_report(self) -> None:
+        """Write the timing report to ``report`` and the trace to ``trace``, if configured.
+        See :meth:`sphinx_versioned.timing.Timings.report` and :meth:`~sphinx_versioned.timing.Timings.trace`.
+        """
+        if self.report:
+            outputs = {x: {"status": "failed", **y} for x, y in self.failures.items()}
+            outputs.update(
+                {x.name: {"status": "built", **self._output_stats(x.name)} for x in self._built_version}
+            )
+            for name, rss in self._peak_rss.items():
+                outputs.setdefault(name, {})["peak_rss"] = rss
+            for name, rss in self._process_rss.items():
+                outputs.setdefault(name, {})["process_peak_rss"] = rss
+            with open(self.report, "w", encoding="utf8") as f:
+                json.dump(self.timings.report(outputs), f, indent=2)
+            log.success(f"wrote timing report to {self.report}")
+
+        if self.trace:
+            with open(self.trace, "w", encoding="utf8") as f:
+                json.dump(self.timings.trace(), f)
+            log.success(f"wrote trace to {self.trace}")
         return
 
     def _build(self, tag, _prebuild: bool = False) -> bool:
@@ -176,38 +845,232 @@ class VersionedDocs:
         -------
         :class:`bool`
         """
-        # Checkout tag/branch
-        self.versions.checkout(tag)
         EventHandlers.CURRENT_VERSION = tag
 
-        with TempDir() as temp_dir:
-            log.debug(f"Checking out the tag in temporary directory: {temp_dir}")
-            source = str(self.local_conf.parent)
-            target = temp_dir
-            argv = (source, target)
-            argv += self._additional_args
-            result = build_main(argv)
-            if result != 0:
-                raise SphinxError
-
-            if _prebuild:
-                log.success(f"pre-build succeded for {tag} :)")
-                return True
-
-            output_with_tag = self.output_dir / tag
-            if not output_with_tag.exists():
-                output_with_tag.mkdir(parents=True, exist_ok=True)
-
-            shutil.copytree(temp_dir, output_with_tag, False, None, dirs_exist_ok=True)
-            log.success(f"build succeded for {tag} ;)")
-            return True
+        with contextlib.ExitStack() as stack:
+            with TIMINGS.span("checkout", str(tag)):
+                if self.export:
+                    root = stack.enter_context(
+                        IsolatedCheckout(
+                            self._git_root,
+                            tag,
+                            path=self._export_path(str(tag)),
+                            export=True,
+                            paths=self._include,
+                        )
+                    )
+                else:
+                    # Checkout tag/branch
+                    self.versions.checkout(tag)
+                    root = None
+
+            return _sphinx_build(
+                str(tag),
+                str(root / self._source) if root else str(self.local_conf.parent),
+                self.output_dir,
+                self._sphinx_args(_prebuild),
+                _prebuild,
+                self._doctree_dir(str(tag)),
+                self._prebuild_html_dir(str(tag), _prebuild),
+                self._nested(str(tag)),
+                self._siblings,
+            )
+
+    def _build_serial(self, versions: list, _prebuild: bool = False) -> dict:
+        """Build ``versions`` one after another in the working tree, restoring the active branch after
+        each of them; or in their exported trees with ``export``. A failed build stops the remaining ones,
+        unless it's a pre-build or ``keep_going`` is set.
+
+        Parameters
+        ----------
+        versions : :class:`list`
+            Branches/tags to build.
+        _prebuild : :class:`bool`
+            Variable to perform/skip pre-builds for selected/all versions.
+
+        Returns
+        -------
+        :class:`dict`
+            Mapping of version name to the success of its build.
+        """
+        # get active branch
+        self._active_branch = self.versions.active_branch
+        if versions and not self.export:
+            self._journal.record_checkout(self._active_branch.name)
+
+        results = {}
+        for tag in versions:
+            log.info(f"{'pre-building' if _prebuild else 'Building'}: {tag}")
+            try:
+                results[tag.name] = self._build(tag.name, _prebuild=_prebuild)
+                self._on_built(tag.name, results[tag.name], _prebuild)
+            except SphinxError as err:
+                results[tag.name] = False
+                self._errors[tag.name] = str(err)
+                if _prebuild:
+                    self._on_built(tag.name, False, _prebuild)
+                elif not self.keep_going:
+                    break
+            finally:
+                # the peak of this process, which builds all the versions
+                self._record_rss(tag.name, peak_rss(), shared=True)
+                # restore to active branch
+                if not self.export:
+                    with TIMINGS.span("checkout", tag.name):
+                        self.versions.checkout(self._active_branch)
+
+        if versions and not self.export:
+            self._journal.record_checkout(None)
+        return results
+
+    def _build_parallel(self, versions: list, _prebuild: bool = False) -> dict:
+        """Build ``versions`` concurrently in ``jobs`` worker processes.
+
+        Every version is checked out into an :class:`~sphinx_versioned.versions.IsolatedCheckout`, so neither
+        the working tree nor the class-level state of :class:`~sphinx_versioned.sphinx_.EventHandlers` is
+        shared between builds. The versions assigned to the same worktree of the
+        :class:`~sphinx_versioned.versions.WorktreePool` are built one after another; with ``export``, every
+        version is exported into its own directory instead, and the versions are spread evenly over ``jobs``
+        chains. Every chain is built by a worker process, which is replaced by a fresh one after
+        ``max_worker_builds`` builds, see :meth:`_build_chain`.
+
+        Parameters
+        ----------
+        versions : :class:`list`
+            Branches/tags to build.
+        _prebuild : :class:`bool`
+            Variable to perform/skip pre-builds for selected/all versions.
+
+        Returns
+        -------
+        :class:`dict`
+            Mapping of version name to the success of its build.
+        """
+        if not versions:
+            return {}
+
+        state = {
+            "event_handlers": {
+                "VERSIONS": EventHandlers.VERSIONS,
+                "RESET_INTERSPHINX_MAPPING": EventHandlers.RESET_INTERSPHINX_MAPPING,
+                "FLYOUT_FLOATING_BADGE": EventHandlers.FLYOUT_FLOATING_BADGE,
+                "RELINK": EventHandlers.RELINK,
+                "VERSIONS_JSON": EventHandlers.VERSIONS_JSON,
+            },
+            "sphinx_compatibility": self.sphinx_compatibility,
+            "worktree_lock": multiprocessing.Lock(),
+            "memory_limit": self.memory_limit,
+        }
+
+        names = [x.name for x in versions]
+        durations = self._history.durations
+        if self.export:
+            chains = balance(names, self.jobs, self.main_branch, durations)
+            chains = [[(x, self._export_path(x)) for x in chain] for chain in chains]
+        else:
+            slots = self._pool.assign(
+                names,
+                {x.name: x.date for x in versions if hasattr(x, "date")},
+                expected_durations(names, durations) if durations else None,
+            )
+            # the main branch first, the others by commit date
+            slots = [sorted(x, key=lambda y: y != self.main_branch) for x in slots]
+            chains = [[(x, self._pool.slot(i)) for x in names] for i, names in enumerate(slots)]
+        chains = [x for x in chains if x]
+
+        results = {}
+        with ThreadPoolExecutor(len(chains)) as pool:
+            futures = [pool.submit(self._build_chain, x, _prebuild, state) for x in chains]
+            for future in as_completed(futures):
+                for name, success, rss, error in future.result():
+                    results[name] = success
+                    if not success:
+                        self._errors[name] = error
+                        log.debug(f"worker failed to build {name}")
+        return results
+
+    def _build_chain(self, chain: list, _prebuild: bool, state: dict) -> list:
+        """Build the versions of ``chain``, ``(name, worktree)`` pairs, one after another in worker processes.
+
+        A worker process builds at most ``max_worker_builds`` versions and is then replaced by a fresh one; so
+        that the memory held by sphinx and the modules imported by autodoc is released in between. By default,
+        a worker builds a single version with ``isolate``, and all the versions of the chain otherwise. A
+        worker which dies, e.g. killed for using too much memory, fails the versions it was building.
+
+        Returns
+        -------
+        :class:`list`
+            ``(name, success, rss, error)`` of every version, see :func:`_build_isolated`.
+        """
+        size = self.max_worker_builds or (1 if self.isolate else len(chain))
+        chunks = [chain[x : x + size] for x in range(0, len(chain), size)]
+        if not _prebuild and len(chunks[0]) > 1 and chain[0][0] == self.main_branch:
+            # build the main branch on its own, to publish the top-level `index.html` right away
+            chunks = [chain[:1]] + [chain[1:][x : x + size] for x in range(0, len(chain) - 1, size)]
+
+        results = []
+        for chunk in chunks:
+            jobs = [self._job(name, worktree, _prebuild) for name, worktree in chunk]
+            try:
+                with ProcessPoolExecutor(1, initializer=_init_worker, initargs=(state,)) as worker:
+                    batch, spans = worker.submit(_build_batch, jobs).result()
+            except BrokenProcessPool:
+                log.error(f"worker died while building {', '.join(x['name'] for x in jobs)}")
+                batch, spans = [(x["name"], False, None, "worker process died") for x in jobs], []
+
+            TIMINGS.merge(spans)
+            results.extend(batch)
+            for index, (name, success, rss, _) in enumerate(batch):
+                # only the first version of a worker is built by a fresh process
+                self._record_rss(name, rss, shared=index > 0)
+                self._on_built(name, success, _prebuild)
+        return results
+
+    def _record_rss(self, name: str, rss: int, shared: bool = False) -> None:
+        """Record the peak resident set size, in bytes, of the process which built ``name``, see
+        :func:`sphinx_versioned.lib.peak_rss`.
+
+        It's the peak of ``name`` if the process was started to build it; otherwise, ``shared``, the peak of
+        the process over every build so far, which may be the one of another version.
+        """
+        if rss is None:
+            return
+        if shared:
+            self._process_rss[name] = max(rss, self._process_rss.get(name, 0))
+            log.info(f"peak RSS of the build process after building {name}: {rss / 1024 / 1024:.0f} MiB")
+            return
+        self._peak_rss[name] = max(rss, self._peak_rss.get(name, 0))
+        log.info(f"peak RSS of {name}: {rss / 1024 / 1024:.0f} MiB")
+        return
+
+    def _job(self, name: str, worktree: pathlib.Path, _prebuild: bool) -> dict:
+        """Job for :func:`_build_isolated`, building ``name`` in ``worktree``."""
+        return {
+            "name": name,
+            "git_root": str(self._git_root),
+            "source": str(self._source),
+            "output_dir": self.output_dir.resolve(),
+            "args": self._sphinx_args(_prebuild),
+            "prebuild": _prebuild,
+            "doctree_dir": self._doctree_dir(name),
+            "html_dir": self._prebuild_html_dir(name, _prebuild),
+            "nested": self._nested(name),
+            "worktree": worktree,
+            "export": self.export,
+            "paths": self._include,
+            "siblings": self._siblings,
+        }
 
     def prebuild(self) -> None:
         """Pre-build workflow.
 
         Method to pre-build the selected/all branches in a temporary environment. Essentially, it builds
-        the various selected/all branches with the vanilla sphinx-build method and pass-on the branches
-        which ends up successful in vanilla sphinx-build.
+        the various selected/all branches with the sphinx-build method and pass-on the branches
+        which ends up successful in sphinx-build.
+
+        The pre-builds already render the versions flyout menu, listing every selected branch/tag.
+        Their html output and doctrees are kept, so that :meth:`~sphinx_versioned.build.VersionedDocs.build`
+        can publish them as is if every pre-build succeeds, or only re-write them otherwise.
 
         The method carries out the transaction via the internal build method
         :meth:`~sphinx_versioned.build.VersionedDocs._build`.
@@ -218,20 +1081,52 @@ class VersionedDocs:
             return
 
         log.debug("Pre-building...")
+        self.timings.stage = "prebuild"
+        EventHandlers.VERSIONS = BuiltVersions(self._versions_to_pre_build, self.versions.build_directory)
 
-        # get active branch
-        self._active_branch = self.versions.active_branch
+        # versions which are up-to-date are known to build
+        versions = self._outdated(self._versions_to_pre_build, ("hexsha", "config", "toolchain"))
+        # aliases share the fate of the version with the same content
+        aliases = self._aliases(versions)
+        versions = self._schedule([x for x in versions if x.name not in aliases])
+        # versions pre-built by the interrupted run, with `resume`
+        done = {x.name: self._journal.prebuilt[x.name] for x in versions if x.name in self._journal.prebuilt}
+        if self.prebuild_mode == "cached":
+            for tag in versions:
+                if tag.name not in done and self._history.built.get(tag.name) == self._build_key(tag):
+                    log.info(
+                        f"built before with the same content, config and toolchain, skipping pre-build: {tag}"
+                    )
+                    done[tag.name] = True
+        if not self.retry_failed:
+            for tag in versions:
+                if tag.name not in done and self._history.failed.get(tag.name) == self._build_key(tag):
+                    log.warning(
+                        "failed before with the same content, config and toolchain, "
+                        f"skipping pre-build: {tag}"
+                    )
+                    done[tag.name] = False
+                    self._errors[tag.name] = "failed before with the same content, config and toolchain"
+        versions = [x for x in versions if x.name not in done]
+        if self._workers:
+            log.info(f"pre-building {len(versions)} versions with {self.jobs} jobs")
+            results = self._build_parallel(versions, _prebuild=True)
+        else:
+            results = self._build_serial(versions, _prebuild=True)
+        # remembered, so that later runs don't pre-build them again, unless `retry_failed`
+        self._prebuild_failed = {x.name: self._build_key(x) for x in versions if results.get(x.name) is False}
+        results.update(done)
+
+        for name, source in aliases.items():
+            results[name] = results.get(source)
+            self._errors.setdefault(name, self._errors.get(source))
 
         for tag in self._versions_to_pre_build:
-            log.info(f"pre-building: {tag}")
-            try:
-                self._build(tag, _prebuild=True)
+            if results.get(tag.name, True):
                 self._versions_to_build.append(tag)
-            except SphinxError:
+            else:
                 log.critical(f"Pre-build failed for {tag}")
-            finally:
-                # restore to active branch
-                self.versions.checkout(self._active_branch.name)
+                self._failed(tag, "prebuild")
 
         log.success(f"Prebuilding successful for {', '.join([x.name for x in self._versions_to_build])}")
         return
@@ -243,26 +1138,117 @@ class VersionedDocs:
         :class:`sphinx_versioned.lib.ConfigInject` and injectes the versions flyout menu to the
         footer or the sidebars.
 
+        The output of a pre-build is published as is, if it was built with the same versions in the
+        flyout menu. Otherwise, the version is re-built from the doctrees of its pre-build; sphinx then only
+        re-reads the sources which changed in between.
+
         The method carries out the transaction via the internal build method
         :meth:`~sphinx_versioned.build.VersionedDocs._build`.
         """
-        # get active branch
-        self._active_branch = self.versions.active_branch
-
         self._built_version = []
+        self.timings.stage = "build"
         EventHandlers.VERSIONS = BuiltVersions(self._versions_to_build, self.versions.build_directory)
+        # with relinking or `versions.json`, the output does not depend on the versions listed in the
+        # flyout menu
+        self._versions_key = (
+            None
+            if EventHandlers.RELINK or EventHandlers.VERSIONS_JSON
+            else fingerprint([x.name for x in self._versions_to_build])
+        )
+
+        versions = self._outdated(self._versions_to_build)
+        outdated = set(x.name for x in versions)
+        # aliases are copied from the version with the same content, once it's built
+        aliases = self._aliases(versions)
+        versions = self._schedule([x for x in versions if x.name not in aliases])
+
+        results = {}
+        # versions published by the interrupted run, with `resume`
+        for tag in versions:
+            if tag.name in self._journal.published:
+                log.info(f"published by the interrupted build, skipping: {tag}")
+                results[tag.name] = True
+                self._on_built(tag.name, True)
+        versions = [x for x in versions if x.name not in results]
+
+        _same_versions = [x.name for x in self._versions_to_build] == [
+            x.name for x in self._versions_to_pre_build
+        ]
+        if EventHandlers.RELINK or EventHandlers.VERSIONS_JSON or _same_versions:
+            for tag in versions:
+                prebuilt = self._scratch_path(tag.name, "html")
+                if prebuilt.is_dir():
+                    _publish(tag.name, prebuilt, self.output_dir, self._nested(tag.name), self._siblings)
+                    log.success(f"published pre-build for {tag}")
+                    results[tag.name] = True
+                    self._on_built(tag.name, True)
+            versions = [x for x in versions if x.name not in results]
+
+        if self._workers:
+            log.info(f"building {len(versions)} versions with {self.jobs} jobs")
+            results.update(self._build_parallel(versions))
+        else:
+            results.update(self._build_serial(versions))
+
+        for name, source in aliases.items():
+            if results.get(source):
+                self._clone(name, source)
+                self._on_built(name, True)
+            results[name] = results.get(source)
+            self._errors.setdefault(name, self._errors.get(source))
 
         for tag in self._versions_to_build:
-            log.info(f"Building: {tag}")
-            try:
-                self._build(tag.name)
-                self._built_version.append(tag)
-            except SphinxError:
+            success = results.get(tag.name)
+            if success is None and tag.name in outdated:
+                # not attempted after a failed build
+                continue
+            if success is False:
                 log.error(f"build failed for {tag}")
-                exit(-1)
-            finally:
-                # restore to active branch
-                self.versions.checkout(self._active_branch)
+                self._failed(tag, "build")
+                continue
+
+            self._built_version.append(tag)
+            if success:
+                self.manifest.record(tag.name, self._version_key(tag))
+
+        if self._versions_key is not None and len(self._built_version) != len(self._versions_to_build):
+            # the built versions are relinked without the failed ones, see `__init__`; record the versions
+            # actually listed in their flyout menu, so that they're rebuilt once the failed ones are fixed
+            versions_key = fingerprint([x.name for x in self._built_version])
+            for tag in self._built_version:
+                if tag.name in self.manifest.versions:
+                    self.manifest.record(
+                        tag.name, {**self.manifest.versions[tag.name], "versions": versions_key}
+                    )
+
+        if self.incremental:
+            self.manifest.save()
+        self._history.update(
+            self.timings.durations(),
+            {
+                x: self._build_key(self._lookup_branch[x])
+                for x, y in results.items()
+                if y and x in self._lookup_branch
+            },
+            self._prebuild_failed,
+        )
+
+        # with `keep_going`, the successful versions are published before exiting, see `__init__`
+        if len(self._built_version) != len(self._versions_to_build) and not self.keep_going:
+            exit(-1)
+        return
+
+    def relink(self) -> None:
+        """Relink workflow.
+
+        Fills the list of versions into the flyout menu of every built version, which were built with
+        a placeholder instead. Only the html files whose list changed are rewritten.
+        See :class:`sphinx_versioned.relink.Relinker`.
+        """
+        relinker = Relinker(
+            self.output_dir, BuiltVersions(self._built_version, self.versions.build_directory)
+        )
+        relinker.relink([x.name for x in self._built_version])
         return
 
     pass
@@ -0,0 +1,148 @@
+"""Journal of a build in progress, to resume it after an interruption."""
+
+import os
+import json
+import pathlib
+import threading
+
+from loguru import logger as log
+
+JOURNAL_FILENAME = ".sphinx-versioned-journal.json"
+
+
+class BuildJournal:
+    """Journal of the build in progress, stored as ``.sphinx-versioned-journal.json`` in the output directory.
+
+    It is written as soon as anything changes: the result of every pre-build, every published version, the ref
+    the working tree was checked out from and the scratch space of the run. A run which is interrupted leaves
+    it behind, so that the next run can restore the working tree and resume where it stopped; a run which
+    completes removes it, see :meth:`finish`.
+
+    Parameters
+    ----------
+    output_dir : :class:`pathlib.Path`
+        Output directory.
+
+    Attributes
+    ----------
+    key : :class:`str`
+        Fingerprint of the run, i.e. its configuration and the commits of its versions.
+    checkout : :class:`str`
+        Ref the working tree was checked out from and has yet to be restored to, if any.
+    scratch : :class:`str`
+        Scratch space of the run, see :class:`sphinx_versioned.lib.TempDir`.
+    prebuilt : :class:`dict`
+        Names of the pre-built versions mapped to the success of their pre-build.
+    published : :class:`list`
+        Names of the versions published to the output directory.
+    """
+
+    def __init__(self, output_dir: pathlib.Path) -> None:
+        self.output_dir = pathlib.Path(output_dir)
+        self.path = self.output_dir / JOURNAL_FILENAME
+        self._lock = threading.RLock()
+        self._reset()
+
+        self.load()
+        return
+
+    def _reset(self, key: str = None) -> None:
+        self.key = key
+        self.checkout = None
+        self.scratch = None
+        self.prebuilt = {}
+        self.published = []
+        return
+
+    def load(self) -> bool:
+        """Load the journal of an interrupted run from the output directory, if it exists.
+
+        Returns
+        -------
+        :class:`bool`
+        """
+        if not self.path.is_file():
+            return False
+
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                data = json.load(f)
+            self.key = data["key"]
+            self.checkout = data.get("checkout")
+            self.scratch = data.get("scratch")
+            self.prebuilt = data.get("prebuilt", {})
+            self.published = data.get("published", [])
+        except (ValueError, KeyError, TypeError):
+            log.warning(f"ignoring unreadable build journal: {self.path}")
+            self._reset()
+            return False
+
+        log.debug(f"loaded build journal: {self.path}")
+        return True
+
+    def save(self) -> None:
+        """Write the journal to the output directory; the previous journal is replaced atomically, so that an
+        interruption never leaves a partial one behind.
+        """
+        with self._lock:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_name(f"{self.path.name}.tmp")
+            with open(temp, "w", encoding="utf8") as f:
+                json.dump(
+                    {
+                        "key": self.key,
+                        "checkout": self.checkout,
+                        "scratch": self.scratch,
+                        "prebuilt": self.prebuilt,
+                        "published": self.published,
+                    },
+                    f,
+                    indent=2,
+                )
+            os.replace(temp, self.path)
+        return
+
+    def start(self, key: str, scratch: str) -> None:
+        """Start the journal of a new run, forgetting the previous one.
+
+        Parameters
+        ----------
+        key : :class:`str`
+            Fingerprint of the run.
+        scratch : :class:`str`
+            Scratch space of the run.
+        """
+        self._reset(key)
+        self.scratch = scratch
+        self.save()
+        return
+
+    def record_checkout(self, ref: str) -> None:
+        """Record that the working tree was checked out from ``ref``; `None` once it's restored."""
+        with self._lock:
+            self.checkout = ref
+            self.save()
+        return
+
+    def record_prebuild(self, name: str, success: bool) -> None:
+        """Record the result of the pre-build of ``name``."""
+        with self._lock:
+            self.prebuilt[name] = bool(success)
+            self.save()
+        return
+
+    def record_publish(self, name: str) -> None:
+        """Record that ``name`` is published to the output directory."""
+        with self._lock:
+            if name not in self.published:
+                self.published.append(name)
+            self.save()
+        return
+
+    def finish(self) -> None:
+        """Remove the journal, once the run completed."""
+        self.path.unlink(missing_ok=True)
+        self._reset()
+        return
+
+    pass
@@ -2,6 +2,7 @@
 
 import os
 import re
+import sys
 import atexit
 import shutil
 import weakref
@@ -10,6 +11,14 @@ import functools
 
 from loguru import logger as log
 
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+# Units of `parse_size`
+_SIZE_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+
 from sphinx import application
 from sphinx.config import Config as SphinxConfig
 
@@ -45,14 +54,17 @@ class TempDir(object):
     ----------
     defer_atexit: :class:`bool`
         cleanup() to atexit instead of after garbage collection.
+    path: :class:`str`
+        Adopt this existing directory instead of creating one, e.g. the scratch space of an interrupted run.
     """
 
-    def __init__(self, defer_atexit=False):
+    def __init__(self, defer_atexit=False, path=None):
         """Constructor.
 
         :param bool defer_atexit: cleanup() to atexit instead of after garbage collection.
+        :param str path: existing directory to adopt instead of creating one.
         """
-        self.name = tempfile.mkdtemp("sphinx_versioned")
+        self.name = path if path else tempfile.mkdtemp("sphinx_versioned")
         if defer_atexit:
             atexit.register(shutil.rmtree, self.name, True)
             return
@@ -126,3 +138,63 @@ def parse_branch_selection(branches: str) -> tuple:
     log.info(f"select branch: {select_branches}")
     log.info(f"exclude branch: {exclude_branches}")
     return (select_branches, exclude_branches)
+
+
+def parse_size(size: str) -> int:
+    """Parse a size like ``512M`` or ``4G`` into bytes; units are powers of 1024.
+
+    Parameters
+    ----------
+    size : :class:`str`
+        Number of bytes with an optional unit ``K``, ``M``, ``G`` or ``T``, and an optional ``B`` or ``iB``.
+
+    Returns
+    -------
+    :class:`int`
+    """
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*$", size, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"invalid size `{size}`, expected e.g. `512M` or `4G`")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+
+def limit_memory(limit: int) -> bool:
+    """Limit the address space of the current process to ``limit`` bytes; allocations beyond it raise
+    :class:`MemoryError`.
+
+    Parameters
+    ----------
+    limit : :class:`int`
+        Limit in bytes.
+
+    Returns
+    -------
+    :class:`bool`
+        `False` if the platform doesn't support it.
+    """
+    if resource is None or not hasattr(resource, "RLIMIT_AS"):
+        log.warning("memory limits are not supported on this platform")
+        return False
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    return True
+
+
+def peak_rss() -> int:
+    """Peak resident set size in bytes of the current process, or of the largest of its terminated child
+    processes, e.g. the ones of ``sphinx-build -j``, if larger; `None` if the platform doesn't report it.
+
+    Both are peaks since the start of the process, i.e. over every build it ran so far.
+    """
+    if resource is None:
+        return None
+
+    rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # kilobytes on linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
@@ -0,0 +1,166 @@
+"""Build manifest recording the versions built into the output directory."""
+
+import json
+import sphinx
+import hashlib
+import pathlib
+from importlib import metadata
+
+from loguru import logger as log
+
+from sphinx_versioned._version import __version__
+
+MANIFEST_FILENAME = ".sphinx-versioned.json"
+
+
+def fingerprint(obj) -> str:
+    """Stable hash of a JSON-serializable object.
+
+    Parameters
+    ----------
+    obj : :class:`object`
+        Object to hash; non-serializable values are hashed by their :class:`str` representation.
+
+    Returns
+    -------
+    :class:`str`
+    """
+    data = json.dumps(obj, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf8")).hexdigest()
+
+
+def toolchain() -> dict:
+    """Versions of sphinx, sphinx-versioned-docs and every installed distribution.
+
+    The themes and extensions used by a project are not known before sphinx reads its ``conf.py``,
+    so every installed distribution is recorded; upgrading any of them invalidates the builds.
+
+    Returns
+    -------
+    :class:`dict`
+    """
+    packages = {}
+    for dist in metadata.distributions():
+        name = dist.metadata["Name"]
+        if name:
+            packages[name.lower()] = dist.version
+
+    return {
+        "sphinx": sphinx.__version__,
+        "sphinx-versioned-docs": __version__,
+        "packages": dict(sorted(packages.items())),
+    }
+
+
+class BuildManifest:
+    """Manifest of built versions, stored as ``.sphinx-versioned.json`` in the output directory.
+
+    Every built version is recorded with the key it was built with; a version whose key is unchanged on a
+    later run does not have to be built again.
+
+    Parameters
+    ----------
+    output_dir : :class:`pathlib.Path`
+        Output directory.
+    """
+
+    def __init__(self, output_dir: pathlib.Path) -> None:
+        self.output_dir = pathlib.Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILENAME
+        self.toolchain = toolchain()
+        self.versions = {}
+
+        self.load()
+        return
+
+    def load(self) -> bool:
+        """Load the manifest from the output directory, if it exists.
+
+        Returns
+        -------
+        :class:`bool`
+        """
+        if not self.path.is_file():
+            return False
+
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                self.versions = json.load(f).get("versions", {})
+        except (ValueError, AttributeError):
+            log.warning(f"ignoring unreadable build manifest: {self.path}")
+            self.versions = {}
+            return False
+
+        log.debug(f"loaded build manifest: {self.path}")
+        return True
+
+    def save(self) -> None:
+        """Write the manifest to the output directory."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf8") as f:
+            json.dump({"toolchain": self.toolchain, "versions": self.versions}, f, indent=2, sort_keys=True)
+        return
+
+    def key(self, hexsha: str, config: str, versions: str) -> dict:
+        """Key a version is built with.
+
+        Parameters
+        ----------
+        hexsha : :class:`str`
+            Resolved commit sha of the branch/tag.
+        config : :class:`str`
+            Fingerprint of the build configuration.
+        versions : :class:`str`
+            Fingerprint of the versions listed in the version selector menu.
+
+        Returns
+        -------
+        :class:`dict`
+        """
+        return {
+            "hexsha": hexsha,
+            "config": config,
+            "toolchain": fingerprint(self.toolchain),
+            "versions": versions,
+        }
+
+    def is_current(self, name: str, key: dict, fields: tuple = None) -> bool:
+        """Check if ``name`` was built with ``key`` and its output still exists.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            Name of the branch/tag.
+        key : :class:`dict`
+            Key from :meth:`key`.
+        fields : :class:`tuple`
+            Only compare these fields of the key. Default is all of them.
+
+        Returns
+        -------
+        :class:`bool`
+        """
+        recorded = self.versions.get(name)
+        if not recorded or key.get("hexsha") is None:
+            return False
+
+        fields = fields if fields else tuple(key)
+        if any(recorded.get(x) != key.get(x) for x in fields):
+            return False
+
+        return (self.output_dir / name).is_dir()
+
+    def record(self, name: str, key: dict) -> None:
+        """Record that ``name`` was built with ``key``.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            Name of the branch/tag.
+        key : :class:`dict`
+            Key from :meth:`key`.
+        """
+        self.versions[name] = key
+        return
+
+    pass
@@ -0,0 +1,373 @@
+"""Publish built documentation into the output directory."""
+
+import os
+import gzip
+import shutil
+import hashlib
+import filecmp
+import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger as log
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+try:
+    import brotli
+except ImportError:  # optional, for `.br` files, see `compress_tree`
+    brotli = None
+
+# `ioctl` request to clone a file, see ioctl_ficlone(2)
+_FICLONE = 0x40049409
+
+
+def _copy_file(source: pathlib.Path, target: pathlib.Path) -> None:
+    """Copy ``source`` to ``target`` through a temporary file, so that ``target`` is replaced atomically
+    instead of being written in place.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp = target.with_name(f".{target.name}.sv-sync")
+    shutil.copy2(source, temp)
+    os.replace(temp, target)
+    return
+
+
+def _sync_file(source: pathlib.Path, target: pathlib.Path) -> bool:
+    """Copy ``source`` to ``target``, unless their content is identical.
+
+    Returns
+    -------
+    :class:`bool`
+        `True` if ``target`` was written.
+    """
+    try:
+        if target.stat().st_size == source.stat().st_size and filecmp.cmp(source, target, shallow=False):
+            return False
+    except FileNotFoundError:
+        pass
+
+    _copy_file(source, target)
+    return True
+
+
+def sync_tree(
+    source: pathlib.Path, target: pathlib.Path, exclude: tuple = (), jobs: int = None, siblings: tuple = ()
+) -> dict:
+    """Make ``target`` an exact copy of ``source``, writing as little as possible.
+
+    Files are compared by size and content; only new and changed files are copied, using a thread pool,
+    and files which no longer exist in ``source`` are deleted. Unchanged files are left untouched and keep
+    their modification times, so that downstream syncs/uploads only see the actual changes.
+
+    Parameters
+    ----------
+    source : :class:`pathlib.Path`
+        Directory to copy from.
+    target : :class:`pathlib.Path`
+        Directory to copy to.
+    exclude : :class:`tuple`
+        Paths relative to ``target`` which are neither copied nor deleted, e.g. other versions nested in it.
+    jobs : :class:`int`
+        Number of files to compare/copy concurrently. Default is chosen by
+        :class:`concurrent.futures.ThreadPoolExecutor`.
+    siblings : :class:`tuple`
+        Suffixes of files in ``target`` derived from another file, e.g. ``.gz``, see :func:`compress_tree`;
+        they're kept as long as the file they derive from is part of ``source``.
+
+    Returns
+    -------
+    :class:`dict`
+        Number of ``copied``, ``deleted`` and ``unchanged`` files.
+    """
+    source = pathlib.Path(source)
+    target = pathlib.Path(target)
+    exclude = set(pathlib.PurePath(x) for x in exclude)
+
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(source):
+        relpath = pathlib.Path(dirpath).relative_to(source)
+        dirnames[:] = [x for x in dirnames if relpath / x not in exclude]
+        files.update(relpath / x for x in filenames)
+
+    with ThreadPoolExecutor(jobs) as pool:
+        copied = sum(pool.map(lambda x: _sync_file(source / x, target / x), files))
+
+    deleted = 0
+    for dirpath, dirnames, filenames in os.walk(target, topdown=False):
+        relpath = pathlib.Path(dirpath).relative_to(target)
+        if any(x == relpath or x in relpath.parents for x in exclude):
+            continue
+
+        for filename in filenames:
+            if relpath / filename in files:
+                continue
+            if any(filename.endswith(x) and relpath / filename[: -len(x)] in files for x in siblings):
+                continue
+            os.remove(target / relpath / filename)
+            deleted += 1
+
+        if relpath.parts and not any(os.scandir(target / relpath)):
+            os.rmdir(target / relpath)
+
+    log.debug(f"synced {target}: {copied} copied, {deleted} deleted, {len(files) - copied} unchanged")
+    return {"copied": copied, "deleted": deleted, "unchanged": len(files) - copied}
+
+
+# Files worth compressing; the other formats, e.g. images, fonts and `objects.inv`, are compressed already.
+TEXT_SUFFIXES = (".html", ".htm", ".css", ".js", ".json", ".svg", ".txt", ".xml", ".map")
+
+# Formats of the compressed files, which are named after them, e.g. `index.html.gz`.
+COMPRESS_FORMATS = ("gz", "br")
+
+
+def _compress(data: bytes, fmt: str) -> bytes:
+    """Compress ``data`` to ``fmt``, ``gz`` or ``br``, at the highest level; the output is reproducible."""
+    if fmt == "gz":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, mode=brotli.MODE_TEXT)
+
+
+def _compress_file(path: pathlib.Path, formats: tuple, min_size: int) -> int:
+    """Write the compressed files of ``path``, e.g. ``path.gz``, unless they're up-to-date.
+
+    A compressed file is given the modification time of ``path``, and is up-to-date as long as they still
+    match; :func:`sync_tree` keeps the modification time of files whose content is unchanged. Files smaller
+    than ``min_size`` aren't compressed, and their compressed files are removed.
+
+    Returns
+    -------
+    :class:`int`
+        Number of compressed files written.
+    """
+    stat = path.stat()
+    targets = {x: path.with_name(f"{path.name}.{x}") for x in formats}
+    if stat.st_size < min_size:
+        for target in targets.values():
+            target.unlink(missing_ok=True)
+        return 0
+
+    outdated = []
+    for fmt, target in targets.items():
+        try:
+            if target.stat().st_mtime_ns == stat.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        outdated.append(fmt)
+
+    if not outdated:
+        return 0
+
+    data = path.read_bytes()
+    for fmt in outdated:
+        temp = path.with_name(f".{path.name}.{fmt}.sv-compress")
+        temp.write_bytes(_compress(data, fmt))
+        os.utime(temp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(temp, targets[fmt])
+    return len(outdated)
+
+
+def compress_tree(
+    root: pathlib.Path, formats: tuple = COMPRESS_FORMATS, min_size: int = 0, jobs: int = None
+) -> dict:
+    """Write precompressed copies of the text files under ``root``, e.g. ``index.html.gz`` and
+    ``index.html.br``, to be served as is by a web server, e.g. by nginx with
+    ``gzip_static``/``brotli_static``.
+
+    Only the files whose compressed copies are missing or outdated are compressed, using a thread pool.
+    Hidden files and directories, e.g. the ``.store`` of :class:`ContentStore`, are skipped.
+
+    Parameters
+    ----------
+    root : :class:`pathlib.Path`
+        Directory to compress the files of, e.g. the output directory.
+    formats : :class:`tuple`
+        Formats to compress to, out of :data:`COMPRESS_FORMATS`; ``br`` requires the ``brotli`` package.
+    min_size : :class:`int`
+        Size, in bytes, below which files aren't compressed.
+    jobs : :class:`int`
+        Number of files to compress concurrently. Default is chosen by
+        :class:`concurrent.futures.ThreadPoolExecutor`.
+
+    Returns
+    -------
+    :class:`dict`
+        Number of ``compressed`` files written and of text files ``checked``.
+    """
+    if "br" in formats and brotli is None:
+        raise ImportError("compressing to `br` requires the `brotli` package")
+
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [x for x in dirnames if not x.startswith(".")]
+        files.extend(
+            pathlib.Path(dirpath) / x
+            for x in filenames
+            if x.endswith(TEXT_SUFFIXES) and not x.startswith(".")
+        )
+
+    with ThreadPoolExecutor(jobs) as pool:
+        compressed = sum(pool.map(lambda x: _compress_file(x, formats, min_size), files))
+
+    log.success(f"compressed {compressed} files to {', '.join(formats)}; {len(files)} text files checked")
+    return {"compressed": compressed, "checked": len(files)}
+
+
+class ContentStore:
+    """Content-addressed store de-duplicating identical files across versions.
+
+    Every unique file is stored once, as ``<output_dir>/.store/<sha256[:2]>/<sha256>``, and the files in
+    the versions are replaced by hardlinks to it; or by reflinks (copy-on-write clones), on filesystems
+    supporting them. The disk usage of the output directory then scales with its unique content rather than
+    with the number of versions.
+
+    Files are always replaced through :func:`os.replace` in the output directory, never written in place,
+    so a change to one version never leaks into the versions sharing its content.
+
+    Parameters
+    ----------
+    output_dir : :class:`pathlib.Path`
+        Output directory.
+    mode : :class:`str`
+        ``hardlink`` or ``reflink``. Reflinks fall back to hardlinks if the filesystem doesn't support them.
+    jobs : :class:`int`
+        Number of files to de-duplicate concurrently. Default is chosen by
+        :class:`concurrent.futures.ThreadPoolExecutor`.
+    """
+
+    MODES = ("hardlink", "reflink")
+
+    def __init__(self, output_dir: pathlib.Path, mode: str = "hardlink", jobs: int = None) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"unknown de-duplication mode `{mode}`, expected one of {self.MODES}")
+
+        self.path = pathlib.Path(output_dir) / ".store"
+        self.mode = mode
+        self.jobs = jobs
+        self._referenced = set()
+        self._lock = threading.Lock()
+        return
+
+    def _link(self, stored: pathlib.Path, target: pathlib.Path) -> None:
+        """Replace ``target`` by a link to ``stored``."""
+        temp = target.with_name(f".{target.name}.sv-dedup")
+        if self.mode == "reflink":
+            try:
+                _reflink(stored, temp)
+                os.replace(temp, target)
+                return
+            except OSError:
+                with self._lock:
+                    if self.mode == "reflink":
+                        log.warning("filesystem doesn't support reflinks; falling back to hardlinks")
+                        self.mode = "hardlink"
+                if temp.exists():
+                    os.remove(temp)
+
+        os.link(stored, temp)
+        os.replace(temp, target)
+        return
+
+    def _dedup_file(self, target: pathlib.Path) -> int:
+        """De-duplicate ``target``.
+
+        Returns
+        -------
+        :class:`int`
+            Bytes saved, `0` if the file is unique or already linked.
+        """
+        stat = target.stat()
+        # hardlinked files were linked by an earlier run, their content never changes in place.
+        if self.mode == "hardlink" and stat.st_nlink > 1:
+            return 0
+
+        digest = _sha256(target)
+        stored = self.path / digest[:2] / digest
+        self._referenced.add(digest)
+
+        if not stored.exists():
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(target, stored)
+            except FileExistsError:
+                pass
+            else:
+                return 0
+
+        if os.path.samefile(stored, target):
+            return 0
+
+        self._link(stored, target)
+        return stat.st_size
+
+    def dedup(self, roots: list) -> int:
+        """De-duplicate every file under ``roots`` and remove stored files which are no longer used.
+
+        Parameters
+        ----------
+        roots : :class:`list`
+            Directories to de-duplicate, e.g. the output directory of every version.
+
+        Returns
+        -------
+        :class:`int`
+            Bytes saved.
+        """
+        files = []
+        for root in roots:
+            for dirpath, _, filenames in os.walk(root):
+                files.extend(pathlib.Path(dirpath) / x for x in filenames)
+
+        with ThreadPoolExecutor(self.jobs) as pool:
+            saved = sum(pool.map(self._dedup_file, files))
+
+        self.prune()
+        log.success(f"de-duplicated {len(files)} files: {saved / 1024 / 1024:.2f} MiB saved")
+        return saved
+
+    def prune(self) -> int:
+        """Remove stored files which are not used by any version anymore.
+
+        Returns
+        -------
+        :class:`int`
+            Number of removed files.
+        """
+        removed = 0
+        for stored in self.path.glob("*/*"):
+            if self.mode == "hardlink":
+                unused = stored.stat().st_nlink == 1
+            else:
+                unused = stored.name not in self._referenced
+            if unused:
+                os.remove(stored)
+                removed += 1
+
+        log.debug(f"pruned {removed} unused files from {self.path}")
+        return removed
+
+    pass
+
+
+def _sha256(path: pathlib.Path) -> str:
+    """sha256 of the file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(source: pathlib.Path, target: pathlib.Path) -> None:
+    """Create ``target`` as a copy-on-write clone of ``source``; raises :class:`OSError` if unsupported."""
+    if fcntl is None:
+        raise OSError("reflinks are not supported on this platform")
+
+    with open(source, "rb") as fsource, open(target, "wb") as ftarget:
+        fcntl.ioctl(ftarget.fileno(), _FICLONE, fsource.fileno())
+    shutil.copystat(source, target)
+    return
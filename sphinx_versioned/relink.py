@@ -0,0 +1,214 @@
+"""Rewrite the versions listed in the flyout menu of already built html files."""
+
+import os
+import re
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+
+import jinja2
+from loguru import logger as log
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "_templates")
+
+# Region of `versions.html` holding the list of versions.
+VERSIONS_REGION = re.compile(r"(<!--sv-versions-->)(.*?)(<!--/sv-versions-->)", re.DOTALL)
+# Region of `versions.html` holding the name of the current version.
+CURRENT_VERSION_REGION = re.compile(
+    r"(<!--sv-current-version-->)(.*?)(<!--/sv-current-version-->)", re.DOTALL
+)
+
+
+class VersionsFragment:
+    """Renders the list of versions of the flyout menu, ``versions_list.html``, once per version.
+
+    The list only differs between the pages of a version by the relative path to the root of the version,
+    so it is rendered once with a placeholder in place of that path, which is then filled in for each page
+    depth; pages at the same depth share the same string.
+
+    Parameters
+    ----------
+    versions : :class:`sphinx_versioned.versions.BuiltVersions`
+        Versions to list in the flyout menu.
+    versions_json : :class:`bool`
+        Render the placeholder fetching ``versions.json`` instead of the list of versions, see
+        :attr:`sphinx_versioned.sphinx_.EventHandlers.VERSIONS_JSON`.
+    """
+
+    # Stands for the relative path while rendering; can't appear in a branch/tag name or a url.
+    _RELPATH = "\x00relpath\x00"
+
+    def __init__(self, versions, versions_json: bool = False) -> None:
+        # resolve the relative paths once, instead of once per page
+        self.versions = {
+            "tags": dict(versions.tags) if versions else {},
+            "branches": dict(versions.branches) if versions else {},
+        }
+        self.versions_json = versions_json
+
+        env = jinja2.Environment(loader=jinja2.FileSystemLoader(TEMPLATES_DIR))
+        self.template = env.get_template("versions_list.html")
+        self._versions = {}
+        self._rendered = {}
+        return
+
+    def render(self, current_version: str, relpath: str) -> str:
+        """Render the list of versions for a page of ``current_version`` at ``relpath`` from its root.
+
+        Parameters
+        ----------
+        current_version : :class:`str`
+            Version the page belongs to.
+        relpath : :class:`str`
+            Relative path from the page to the root of its version.
+
+        Returns
+        -------
+        :class:`str`
+        """
+        key = (current_version, relpath)
+        if key not in self._rendered:
+            if current_version not in self._versions:
+                self._versions[current_version] = self.template.render(
+                    versions=self.versions,
+                    current_version=current_version,
+                    relpath=self._RELPATH,
+                    versions_json=self.versions_json,
+                )
+            self._rendered[key] = self._versions[current_version].replace(self._RELPATH, relpath)
+        return self._rendered[key]
+
+    pass
+
+
+class Relinker:
+    """Re-renders the list of versions in the flyout menu of every html file in the output directory.
+
+    Each version is built once with an empty placeholder in place of the list of versions, see
+    :attr:`sphinx_versioned.sphinx_.EventHandlers.RELINK`. The relinker then fills in the current list,
+    so that adding or removing a version does not require re-building the other versions.
+    Files whose list is already up-to-date are left untouched, keeping their modification times.
+
+    The same way, :meth:`rewrite` turns a copy of the output of one version into the output of another
+    version built from identical sources, by re-rendering its current version and list of versions.
+
+    Parameters
+    ----------
+    output_dir : :class:`pathlib.Path`
+        Output directory.
+    versions : :class:`sphinx_versioned.versions.BuiltVersions`
+        Versions to list in the flyout menu.
+    jobs : :class:`int`
+        Number of files to rewrite concurrently. Default is chosen by
+        :class:`concurrent.futures.ThreadPoolExecutor`.
+    versions_json : :class:`bool`
+        Render the placeholder fetching ``versions.json`` instead of the list of versions, see
+        :attr:`sphinx_versioned.sphinx_.EventHandlers.VERSIONS_JSON`.
+    """
+
+    def __init__(
+        self, output_dir: pathlib.Path, versions, jobs: int = None, versions_json: bool = False
+    ) -> None:
+        self.output_dir = pathlib.Path(output_dir)
+        self.jobs = jobs
+        self.versions_json = versions_json
+        self.fragment = VersionsFragment(versions, versions_json)
+        return
+
+    def render(self, current_version: str, relpath: str) -> str:
+        """Render the list of versions for a page of ``current_version`` at ``relpath`` from its root.
+
+        Parameters
+        ----------
+        current_version : :class:`str`
+            Version the page belongs to.
+        relpath : :class:`str`
+            Relative path from the page to the root of its version.
+
+        Returns
+        -------
+        :class:`str`
+        """
+        return self.fragment.render(current_version, relpath)
+
+    def _files(self, root: pathlib.Path, name: str, nested: set) -> list:
+        """List the html files under ``root``, pages of version ``name``, with the rendered list of versions
+        for each of them. ``nested`` are the paths, relative to ``root``, of other versions nested inside it.
+        """
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirpath = pathlib.Path(dirpath)
+            # skip versions nested inside this one, e.g. `feature/x` inside `feature`
+            dirnames[:] = [x for x in dirnames if (dirpath / x).relative_to(root).as_posix() not in nested]
+            relpath = "../" * len(dirpath.relative_to(root).parts)
+            fragment = self.render(name, relpath)
+            files.extend((dirpath / x, name, fragment) for x in filenames if x.endswith(".html"))
+        return files
+
+    @staticmethod
+    def _rewrite(path: pathlib.Path, current_version: str, fragment: str) -> bool:
+        """Replace the current version and the list of versions in ``path``; the file is only written if it
+        changes.
+        """
+        with open(path, "r", encoding="utf8") as f:
+            data = f.read()
+
+        new = CURRENT_VERSION_REGION.sub(lambda m: m.group(1) + current_version + m.group(3), data)
+        new = VERSIONS_REGION.sub(lambda m: m.group(1) + fragment + m.group(3), new)
+        if new == data:
+            return False
+
+        temp = path.with_name(f".{path.name}.sv-relink")
+        with open(temp, "w", encoding="utf8") as f:
+            f.write(new)
+        os.replace(temp, path)
+        return True
+
+    def relink(self, names: list) -> int:
+        """Rewrite the list of versions in every html file of the versions ``names``.
+
+        Parameters
+        ----------
+        names : :class:`list`
+            Names of the versions to relink.
+
+        Returns
+        -------
+        :class:`int`
+            Number of rewritten files.
+        """
+        names = set(names)
+        files = []
+        for name in names:
+            prefix = f"{name}/"
+            nested = set(x[len(prefix) :] for x in names if x.startswith(prefix))
+            files.extend(self._files(self.output_dir / name, name, nested))
+
+        with ThreadPoolExecutor(self.jobs) as pool:
+            rewritten = sum(pool.map(lambda x: self._rewrite(*x), files))
+
+        log.success(f"relinked versions menu: {rewritten} of {len(files)} html files changed")
+        return rewritten
+
+    def rewrite(self, root: pathlib.Path, current_version: str) -> int:
+        """Rewrite every html file under ``root`` into a page of ``current_version``.
+
+        Parameters
+        ----------
+        root : :class:`pathlib.Path`
+            Copy of the output of another version, built from the same sources.
+        current_version : :class:`str`
+            Name of the version the files belong to.
+
+        Returns
+        -------
+        :class:`int`
+            Number of rewritten files.
+        """
+        files = self._files(pathlib.Path(root), current_version, set())
+        with ThreadPoolExecutor(self.jobs) as pool:
+            rewritten = sum(pool.map(lambda x: self._rewrite(*x), files))
+
+        log.debug(f"rewrote {rewritten} of {len(files)} html files for {current_version}")
+        return rewritten
+
+    pass
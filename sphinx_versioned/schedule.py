@@ -0,0 +1,147 @@
+"""Schedule the builds of the versions."""
+
+import json
+import pathlib
+
+from loguru import logger as log
+
+
+class BuildHistory:
+    """Durations of the builds of every version on previous runs, and the keys they were last built
+    successfully with or failed to pre-build with, stored as ``.sphinx-versioned-history.json``.
+
+    Parameters
+    ----------
+    directory : :class:`pathlib.Path`
+        Directory the history is kept in, the cache directory or the output directory.
+
+    Attributes
+    ----------
+    durations : :class:`dict`
+        Seconds spent building every version.
+    built : :class:`dict`
+        Fingerprint of the tree, configuration and toolchain every version was last built successfully with.
+    failed : :class:`dict`
+        Fingerprint of the tree, configuration and toolchain every version last failed to pre-build with.
+    """
+
+    FILENAME = ".sphinx-versioned-history.json"
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.path = pathlib.Path(directory) / self.FILENAME
+        self.durations = {}
+        self.built = {}
+        self.failed = {}
+
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                data = json.load(f)
+            self.durations = data.get("durations", {})
+            self.built = data.get("built", {})
+            self.failed = data.get("failed", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return
+
+    def update(self, durations: dict, built: dict = None, failed: dict = None) -> None:
+        """Record the ``durations``, in seconds, of the versions built on this run and the keys of the ones
+        ``built`` successfully and of the ones which ``failed`` to pre-build, then save the history.
+
+        The versions which were not built keep their previous records.
+        """
+        if not durations and not built and not failed:
+            return
+
+        self.durations.update(durations)
+        for name, key in (built or {}).items():
+            self.built[name] = key
+            self.failed.pop(name, None)
+        for name, key in (failed or {}).items():
+            self.failed[name] = key
+            self.built.pop(name, None)
+        try:
+            with open(self.path, "w", encoding="utf8") as f:
+                json.dump(
+                    {"durations": self.durations, "built": self.built, "failed": self.failed},
+                    f,
+                    indent=2,
+                    sort_keys=True,
+                )
+        except OSError as err:
+            log.debug(f"can't save the build history: {err}")
+        return
+
+    pass
+
+
+def expected_durations(names: list, durations: dict) -> dict:
+    """Expected duration of every version of ``names``; versions without a previous duration are expected to
+    take as long as the longest known one, so that they're not left for the end.
+
+    Parameters
+    ----------
+    names : :class:`list`
+        Names of the versions.
+    durations : :class:`dict`
+        Durations of the versions on previous runs, see :class:`BuildHistory`.
+
+    Returns
+    -------
+    :class:`dict`
+    """
+    known = [durations[x] for x in names if x in durations]
+    default = max(known) if known else 0
+    return {x: durations.get(x, default) for x in names}
+
+
+def schedule(names: list, main: str = None, durations: dict = None) -> list:
+    """Order the versions ``names`` to build: ``main`` first, as the top-level ``index.html`` redirects to it,
+    then the longest ones first.
+
+    Parameters
+    ----------
+    names : :class:`list`
+        Names of the versions.
+    main : :class:`str`
+        Name of the main branch.
+    durations : :class:`dict`
+        Durations of the versions on previous runs, see :class:`BuildHistory`.
+
+    Returns
+    -------
+    :class:`list`
+    """
+    expected = expected_durations(names, durations or {})
+    # `sorted` is stable; versions with the same expected duration keep their order
+    return sorted(names, key=lambda x: (x != main, -expected[x]))
+
+
+def balance(names: list, size: int, main: str = None, durations: dict = None) -> list:
+    """Spread the versions ``names`` over ``size`` workers building them one after another, so that they all
+    finish about the same time: the longest version goes first to the worker with the least work so far.
+
+    Parameters
+    ----------
+    names : :class:`list`
+        Names of the versions.
+    size : :class:`int`
+        Number of workers.
+    main : :class:`str`
+        Name of the main branch, which is built first.
+    durations : :class:`dict`
+        Durations of the versions on previous runs, see :class:`BuildHistory`.
+
+    Returns
+    -------
+    :class:`list`
+        For every worker, the names of the versions it builds, in order.
+    """
+    expected = expected_durations(names, durations or {})
+    chains = [[] for _ in range(size)]
+    load = [0] * size
+    for name in schedule(names, main, durations):
+        index = min(range(size), key=lambda x: load[x])
+        chains[index].append(name)
+        # a version without a known duration still counts as one
+        load[index] += expected[name] or 1
+    return chains
@@ -0,0 +1,227 @@
+"""Select the branches/tags to build."""
+
+import re
+import fnmatch
+
+from loguru import logger as log
+
+# Versions like `1`, `v1.2`, `v1.2.3`, `1.2.3rc1` or `v1.2.3-beta.1`
+VERSION_PATTERN = re.compile(
+    r"^[vV]?(?P<major>\d+)(?:\.(?P<minor>\d+))?(?:\.(?P<patch>\d+))?"
+    r"(?:(?P<sep>[-.+_]?)(?P<suffix>[0-9A-Za-z][0-9A-Za-z.-]*))?$"
+)
+# Comparators of a version range, like `>=2.0`
+_COMPARATOR_PATTERN = re.compile(r"^(?P<op>>=|<=|==|!=|>|<|=)?(?P<version>\S+)$")
+_OPERATORS = {
+    ">=": lambda x, y: x >= y,
+    "<=": lambda x, y: x <= y,
+    ">": lambda x, y: x > y,
+    "<": lambda x, y: x < y,
+    "==": lambda x, y: x == y,
+    "=": lambda x, y: x == y,
+    "!=": lambda x, y: x != y,
+}
+
+
+def parse_version(name: str) -> tuple:
+    """Parse the branch/tag ``name`` as a version.
+
+    Parameters
+    ----------
+    name : :class:`str`
+        Name of the branch/tag.
+
+    Returns
+    -------
+    :class:`tuple`
+        ``(major, minor, patch, release, suffix)``, which sorts like the versions, or `None` if ``name`` is
+        not a version. ``release`` is `False` for pre-releases, like ``1.2.3rc1``; build metadata, like
+        ``1.2.3+local``, does not make a pre-release.
+    """
+    match = VERSION_PATTERN.match(name)
+    if not match:
+        return None
+
+    suffix = match.group("suffix") or ""
+    release = not suffix or match.group("sep") == "+"
+    return (
+        int(match.group("major")),
+        int(match.group("minor") or 0),
+        int(match.group("patch") or 0),
+        release,
+        suffix,
+    )
+
+
+def parse_range(spec: str) -> list:
+    """Parse a version range, like ``>=2.0,<4``, into its comparators.
+
+    Parameters
+    ----------
+    spec : :class:`str`
+        Comparators separated by ``,`` or spaces, all of which must hold. A version without operator must
+        match exactly.
+
+    Returns
+    -------
+    :class:`list`
+        ``(operator, version)`` of every comparator.
+    """
+    comparators = []
+    # `>= 2.0` -> `>=2.0`
+    spec = re.sub(r"([<>=!]=?)\s+", r"\1", spec)
+    for x in re.split(r"[,\s]+", spec.strip()):
+        match = _COMPARATOR_PATTERN.match(x)
+        version = parse_version(match.group("version")) if match else None
+        if version is None:
+            raise ValueError(f"invalid version range `{spec}`: `{x}`")
+        comparators.append((_OPERATORS[match.group("op") or "=="], version[:3] + (True, "")))
+    return comparators
+
+
+class VersionSelector:
+    """Selects the branches/tags to build, in a single pass over their names.
+
+    The select and exclude patterns, see :func:`sphinx_versioned.lib.parse_branch_selection`, are compiled
+    into one regular expression each; plain names are looked up directly. The selected branches/tags keep the
+    order of the first pattern selecting them.
+
+    Branches/tags named like versions, e.g. ``v1.2.3``, can further be filtered by a version range and
+    reduced to the newest releases of the latest major/minor versions; the others are not affected.
+
+    Parameters
+    ----------
+    select : :class:`list`
+        Patterns of the branches/tags to select. Default is all of them.
+    exclude : :class:`list`
+        Patterns of the branches/tags to exclude.
+    version_range : :class:`str`
+        Only keep the versions in this range, e.g. ``>=2.0,<4``. See :func:`parse_range`.
+    latest_minors : :class:`int`
+        Only keep the newest patch release of each of the latest ``latest_minors`` minor versions.
+    latest_majors : :class:`int`
+        Only keep the newest release of each of the latest ``latest_majors`` major versions.
+    """
+
+    def __init__(
+        self,
+        select: list = None,
+        exclude: list = None,
+        version_range: str = None,
+        latest_minors: int = None,
+        latest_majors: int = None,
+    ) -> None:
+        self.select_patterns = list(select) if select else []
+        self.exclude_patterns = list(exclude) if exclude else []
+        self.version_range = parse_range(version_range) if version_range else []
+        self.latest_minors = latest_minors
+        self.latest_majors = latest_majors
+
+        # index of the first plain name/pattern selecting a name
+        self._select_names = {}
+        globs = []
+        for index, pattern in enumerate(self.select_patterns):
+            if not any(x in pattern for x in "*?["):
+                self._select_names.setdefault(pattern, index)
+            else:
+                globs.append(f"(?P<p{index}>{fnmatch.translate(pattern)})")
+        self._select_globs = re.compile("|".join(globs)) if globs else None
+        self._exclude = (
+            re.compile("|".join(fnmatch.translate(x) for x in self.exclude_patterns))
+            if self.exclude_patterns
+            else None
+        )
+
+        self.missing = []
+        return
+
+    def _selected(self, name: str) -> int:
+        """Index of the first select pattern matching ``name``, or `None`."""
+        if not self.select_patterns:
+            return 0
+
+        index = self._select_names.get(name)
+        match = self._select_globs.match(name) if self._select_globs else None
+        if match:
+            glob_index = int(match.lastgroup[1:])
+            index = glob_index if index is None else min(index, glob_index)
+        return index
+
+    def excluded(self, name: str) -> bool:
+        """Check if ``name`` is excluded."""
+        return bool(self._exclude and self._exclude.match(name))
+
+    def select(self, names: list) -> list:
+        """Select among the branches/tags ``names``.
+
+        The select patterns which match none of ``names`` are stored in :attr:`missing`.
+
+        Parameters
+        ----------
+        names : :class:`list`
+            Names of the branches/tags.
+
+        Returns
+        -------
+        :class:`list`
+            Names of the selected branches/tags.
+        """
+        selected = []
+        matched = set()
+        for position, name in enumerate(names):
+            index = self._selected(name)
+            if index is None:
+                continue
+            matched.add(index)
+            if not self.excluded(name):
+                selected.append((index, position, name))
+
+        selected = [x[2] for x in sorted(selected)]
+        selected = self._retain(selected)
+
+        # a pattern may only match names which an earlier pattern matched as well
+        self.missing = [
+            x
+            for index, x in enumerate(self.select_patterns)
+            if index not in matched and not any(fnmatch.fnmatchcase(y, x) for y in names)
+        ]
+
+        log.debug(f"selected {len(selected)} of {len(names)} branches/tags")
+        return selected
+
+    def _retain(self, names: list) -> list:
+        """Apply the version range and retention rules to ``names``."""
+        if not (self.version_range or self.latest_minors or self.latest_majors):
+            return names
+
+        versions = {x: parse_version(x) for x in names}
+        versions = {x: y for x, y in versions.items() if y is not None}
+        in_range = set(
+            x for x, y in versions.items() if all(op(y, bound) for op, bound in self.version_range)
+        )
+
+        if self.latest_minors or self.latest_majors:
+            retained = set()
+            for series, latest in ((2, self.latest_minors), (1, self.latest_majors)):
+                if latest:
+                    retained.update(self._newest(in_range, versions, series, latest))
+            in_range = retained
+
+        return [x for x in names if x not in versions or x in in_range]
+
+    @staticmethod
+    def _newest(names: set, versions: dict, series: int, latest: int) -> list:
+        """Newest release of each of the ``latest`` newest series of ``names``; a series being the first
+        ``series`` components of the versions.
+        """
+        newest = {}
+        for name in names:
+            version = versions[name]
+            if not version[3]:
+                continue
+            key = version[:series]
+            if key not in newest or version > versions[newest[key]]:
+                newest[key] = name
+        return [newest[x] for x in sorted(newest, reverse=True)[:latest]]
+
+    pass
@@ -1,12 +1,15 @@
 """Interface with Sphinx."""
 
 import os
+import time
 
 from loguru import logger as log
 from sphinx.util.fileutil import copy_asset_file
 from sphinx.jinja2glue import SphinxFileSystemLoader
 
 from sphinx_versioned._version import __version__
+from sphinx_versioned.relink import VersionsFragment
+from sphinx_versioned.timing import TIMINGS
 
 STATIC_DIR = os.path.join(os.path.dirname(__file__), "_static")
 
@@ -26,6 +29,12 @@ class EventHandlers(object):
         Reset intersphinx mapping after each build.
     FLYOUT_FLOATING_BADGE : :class:`bool`
         Turns the version selector menu into a floating badge.
+    RELINK : :class:`bool`
+        Leave a placeholder in place of the list of versions, to be filled in by
+        :class:`sphinx_versioned.relink.Relinker` after the build.
+    VERSIONS_JSON : :class:`bool`
+        Let ``_versions_json.js`` fetch the list of versions from ``versions.json`` at the output root,
+        instead of rendering it into every page.
     """
 
     CURRENT_VERSION: str = None
@@ -33,6 +42,12 @@ class EventHandlers(object):
     ASSETS_TO_COPY: set = set()
     RESET_INTERSPHINX_MAPPING: bool = False
     FLYOUT_FLOATING_BADGE: bool = False
+    RELINK: bool = False
+    VERSIONS_JSON: bool = False
+    # List of versions of the flyout menu, rendered once per build by `builder_inited`.
+    _VERSIONS_FRAGMENT: VersionsFragment = None
+    # Current sphinx phase and its start, see `env_before_read_docs`/`env_updated`.
+    _PHASE: tuple = None
     # Themes which do not require the additional `_rtd_versions.js` script file.
     _FLYOUT_NOSCRIPT_THEMES: list = [
         "sphinx_rtd_theme",
@@ -50,13 +65,17 @@ class EventHandlers(object):
         # Add this extension's _templates directory to Sphinx.
         templates_dir = os.path.join(os.path.dirname(__file__), "_templates")
         log.debug(f"Templates dir: {templates_dir}")
-        if app.builder.name != "latex":
+        # e.g. not for the `dummy` builder of a pre-build, see `VersionedDocs.PREBUILD_MODES`
+        if app.builder.format == "html":
             app.builder.templates.pathchain.insert(0, templates_dir)
             app.builder.templates.loaders.insert(0, SphinxFileSystemLoader(templates_dir))
             app.builder.templates.templatepathlen += 1
 
         log.info(f"Theme: {app.config.html_theme}")
 
+        # Render the list of versions once, instead of once per page.
+        cls._VERSIONS_FRAGMENT = VersionsFragment(cls.VERSIONS, cls.VERSIONS_JSON)
+
         # Add css properties to bold currently-active branch/tag
         app.add_css_file("_rst_properties.css")
         cls.ASSETS_TO_COPY.add("_rst_properties.css")
@@ -68,6 +87,52 @@ class EventHandlers(object):
             cls.ASSETS_TO_COPY.add("_rtd_versions.js")
             cls.ASSETS_TO_COPY.add("badge_only.css")
             cls.ASSETS_TO_COPY.add("fontawesome-webfont.woff")
+
+        # Insert the script rendering the list of versions; separate from the flyout script, as the themes
+        # of `_FLYOUT_NOSCRIPT_THEMES` toggle their flyout menu themselves
+        if cls.VERSIONS_JSON:
+            app.add_js_file("_versions_json.js")
+            cls.ASSETS_TO_COPY.add("_versions_json.js")
+        return
+
+    @classmethod
+    def env_before_read_docs(cls, app, env, docnames) -> None:
+        """Start timing the read phase, see :data:`sphinx_versioned.timing.TIMINGS`.
+
+        Parameters
+        ----------
+        app : :class:`sphinx.application.Sphinx`
+            Sphinx application object.
+        env : :class:`sphinx.environment.BuildEnvironment`
+            Build environment.
+        docnames : :class:`list`
+            Names of the documents to read.
+        """
+        cls._PHASE = ("read", time.time())
+        return
+
+    @classmethod
+    def env_updated(cls, app, env) -> None:
+        """Record the read phase and start timing the write phase.
+
+        Parameters
+        ----------
+        app : :class:`sphinx.application.Sphinx`
+            Sphinx application object.
+        env : :class:`sphinx.environment.BuildEnvironment`
+            Build environment.
+        """
+        cls._end_phase()
+        cls._PHASE = ("write", time.time())
+        return
+
+    @classmethod
+    def _end_phase(cls) -> None:
+        """Record the current sphinx phase, if any, see :data:`sphinx_versioned.timing.TIMINGS`."""
+        if cls._PHASE:
+            phase, start = cls._PHASE
+            TIMINGS.record(phase, start, time.time(), str(cls.CURRENT_VERSION))
+        cls._PHASE = None
         return
 
     @classmethod
@@ -81,6 +146,8 @@ class EventHandlers(object):
         exc : :class:`Exception`
             Exception.
         """
+        cls._end_phase()
+
         if cls.RESET_INTERSPHINX_MAPPING:
             log.debug("Reset intersphinx mappings")
             for key, value in app.config.intersphinx_mapping.values():
@@ -90,9 +157,10 @@ class EventHandlers(object):
         if app.builder.format == "html" and not exc:
             staticdir = os.path.join(app.builder.outdir, "_static")
 
-            for asset in cls.ASSETS_TO_COPY:
-                copy_asset_file(f"{STATIC_DIR}/{asset}", staticdir)
-                log.debug(f"copying `{asset}`: {STATIC_DIR}/{asset} to {staticdir}")
+            with TIMINGS.span("assets", str(cls.CURRENT_VERSION)):
+                for asset in cls.ASSETS_TO_COPY:
+                    copy_asset_file(f"{STATIC_DIR}/{asset}", staticdir)
+                    log.debug(f"copying `{asset}`: {STATIC_DIR}/{asset} to {staticdir}")
 
             # Reset Assets to copy
             cls.ASSETS_TO_COPY.clear()
@@ -127,10 +195,17 @@ class EventHandlers(object):
         context["project_url"] = app.config.sv_project_url
         context["versions"] = cls.VERSIONS
         context["floating_badge"] = cls.FLYOUT_FLOATING_BADGE
+        context["relink"] = cls.RELINK
+        context["versions_json"] = cls.VERSIONS_JSON
 
         # Relative path to master_doc
         relpath = (pagename.count("/")) * "../"
         context["relpath"] = relpath
+
+        # Pre-rendered list of versions, unless it's left to the relinker.
+        context["versions_list"] = ""
+        if cls.VERSIONS_JSON or not cls.RELINK:
+            context["versions_list"] = cls._VERSIONS_FRAGMENT.render(cls.CURRENT_VERSION, relpath)
         return
 
 
@@ -144,7 +219,8 @@ def setup(app) -> dict:
 
     Returns
     -------
-    extension version : :class:`dict`
+    extension metadata : :class:`dict`
+        Version of the extension; it's safe for sphinx's parallel read and write.
     """
     # Needed for banner.
     if not app.config.html_static_path:
@@ -155,6 +231,10 @@ def setup(app) -> dict:
 
     # Event handlers.
     app.connect("builder-inited", EventHandlers.builder_inited)
+    app.connect("env-before-read-docs", EventHandlers.env_before_read_docs)
+    app.connect("env-updated", EventHandlers.env_updated)
     app.connect("html-page-context", EventHandlers.html_page_context)
     app.connect("build-finished", EventHandlers.builder_finished_tasks)
-    return dict(version=__version__)
+    # The extension stores nothing in the build environment, and the state of `EventHandlers` is set up before
+    # sphinx forks its parallel readers/writers, which inherit it.
+    return dict(version=__version__, parallel_read_safe=True, parallel_write_safe=True)
@@ -0,0 +1,170 @@
+"""Measure the phases of a build."""
+
+import os
+import time
+import contextlib
+
+from loguru import logger as log
+
+
+class Timings:
+    """Records the wall-clock spans of the phases of a build, e.g. ``checkout`` or ``read``.
+
+    Spans are recorded with :func:`time.time`, so that the spans recorded by the worker processes of a
+    parallel build, see :meth:`merge`, share the same clock as the parent process.
+
+    Attributes
+    ----------
+    stage : :class:`str`
+        Stage the spans are recorded for, ``prebuild`` or ``build``, if any.
+    """
+
+    def __init__(self) -> None:
+        self.spans = []
+        self.stage = None
+        return
+
+    @contextlib.contextmanager
+    def span(self, phase: str, version: str = None):
+        """Record the time spent inside the ``with`` block as ``phase``.
+
+        Parameters
+        ----------
+        phase : :class:`str`
+            Name of the phase, e.g. ``checkout``.
+        version : :class:`str`
+            Branch/tag the phase belongs to, if any.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record(phase, start, time.time(), version)
+
+    def record(self, phase: str, start: float, end: float, version: str = None) -> None:
+        """Record a span of ``phase`` from ``start`` to ``end``, as returned by :func:`time.time`."""
+        self.spans.append(
+            {
+                "phase": phase,
+                "version": version,
+                "stage": self.stage,
+                "start": start,
+                "end": end,
+                "pid": os.getpid(),
+            }
+        )
+        return
+
+    def merge(self, spans: list) -> None:
+        """Add the ``spans`` recorded by another process."""
+        self.spans.extend(spans)
+        return
+
+    def clear(self) -> None:
+        """Forget every recorded span."""
+        self.spans.clear()
+        self.stage = None
+        return
+
+    def totals(self) -> dict:
+        """Total seconds spent in every phase, in the order they were first recorded.
+
+        The spans of concurrent builds add up; the totals of a parallel build may exceed its wall-clock time.
+
+        Returns
+        -------
+        :class:`dict`
+        """
+        totals = {}
+        for x in self.spans:
+            totals[x["phase"]] = totals.get(x["phase"], 0) + x["end"] - x["start"]
+        return totals
+
+    def durations(self) -> dict:
+        """Total seconds spent building every version, over all its phases and stages.
+
+        Returns
+        -------
+        :class:`dict`
+        """
+        durations = {}
+        for x in self.spans:
+            if x["version"] is not None:
+                durations[x["version"]] = durations.get(x["version"], 0) + x["end"] - x["start"]
+        return durations
+
+    def report(self, outputs: dict = None) -> dict:
+        """Report of the time spent in every phase, in total and for every stage of every version.
+
+        Parameters
+        ----------
+        outputs : :class:`dict`
+            Additional entries of every version, e.g. the size of its output.
+
+        Returns
+        -------
+        :class:`dict`
+            ``wall`` seconds from the first to the last span, ``phases`` from :meth:`totals` and ``versions``,
+            mapping every version to the seconds of every phase of each of its stages, and its ``outputs``.
+        """
+        versions = {}
+        for x in self.spans:
+            if x["version"] is None:
+                continue
+            phases = versions.setdefault(x["version"], {}).setdefault(x["stage"] or "build", {})
+            phases[x["phase"]] = phases.get(x["phase"], 0) + x["end"] - x["start"]
+
+        for name, output in (outputs or {}).items():
+            versions.setdefault(name, {}).update(output)
+
+        wall = max(x["end"] for x in self.spans) - min(x["start"] for x in self.spans) if self.spans else 0
+        return {"wall": wall, "phases": self.totals(), "versions": versions}
+
+    def trace(self) -> dict:
+        """Spans in the Chrome trace event format, to be opened with ``chrome://tracing`` or
+        `Perfetto <https://ui.perfetto.dev>`_. Every process gets its own track, so the builds of parallel
+        workers show up side by side.
+
+        Returns
+        -------
+        :class:`dict`
+        """
+        origin = min((x["start"] for x in self.spans), default=0)
+        pids = list(dict.fromkeys(x["pid"] for x in self.spans))
+
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 0,
+                "tid": pid,
+                "args": {"name": "main" if pid == os.getpid() else f"worker {pid}"},
+            }
+            for pid in pids
+        ]
+        for x in self.spans:
+            events.append(
+                {
+                    "name": f"{x['version']}: {x['phase']}" if x["version"] else x["phase"],
+                    "cat": x["stage"] or "build",
+                    "ph": "X",
+                    "ts": (x["start"] - origin) * 1e6,
+                    "dur": (x["end"] - x["start"]) * 1e6,
+                    "pid": 0,
+                    "tid": x["pid"],
+                    "args": {"version": x["version"], "stage": x["stage"]},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> None:
+        """Log the total time spent in every phase."""
+        totals = ", ".join(f"{x} {y:.2f}s" for x, y in self.totals().items())
+        log.info(f"timings: {totals}")
+        return
+
+    pass
+
+
+# Spans of the current process; the worker processes of a parallel build return theirs to the parent.
+TIMINGS = Timings()
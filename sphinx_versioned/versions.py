@@ -3,10 +3,115 @@ import os
 os.environ["GIT_PYTHON_REFRESH"] = "quiet"
 
 import git
+import json
+import types
+import shutil
+import hashlib
 import pathlib
+import contextlib
 from abc import ABC
 from loguru import logger as log
 
+from sphinx_versioned.lib import TempDir
+
+
+def _blob(path: pathlib.Path) -> tuple:
+    """git blob sha and file mode of the file at ``path``, or `None` if it's not a file."""
+    if path.is_symlink():
+        data = os.readlink(path).encode("utf8")
+        mode = git.Blob.link_mode
+    elif path.is_file():
+        data = path.read_bytes()
+        mode = git.Blob.executable_mode if path.stat().st_mode & 0o111 else git.Blob.file_mode
+    else:
+        return None
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest(), mode
+
+
+def export_tree(repo: git.Repo, name: str, path: pathlib.Path, paths: list = None) -> dict:
+    """Write the tree of the branch/tag ``name`` into the directory ``path``, streaming the objects from the
+    git object database; the working tree, index and ``HEAD`` of ``repo`` are left untouched.
+
+    Like ``git archive``, but ``export-ignore`` attributes are not applied and ``path`` is updated in place:
+    only the files which differ from ``name`` are written, others keep their modification times, and files
+    which are not part of ``name`` are deleted.
+
+    Parameters
+    ----------
+    repo : :class:`git.Repo`
+        Repository to export from.
+    name : :class:`str`
+        Name of the branch/tag/commit to export.
+    path : :class:`pathlib.Path`
+        Directory to export to.
+    paths : :class:`list`
+        Only export these paths, relative to the repository root. Default is the whole tree.
+
+    Returns
+    -------
+    :class:`dict`
+        Number of ``written``, ``deleted`` and ``unchanged`` files.
+    """
+    path = pathlib.Path(path)
+    tree = repo.commit(name).tree
+
+    roots = []
+    for x in paths if paths else ("",):
+        x = pathlib.PurePosixPath(x).as_posix().strip("/")
+        try:
+            roots.append(tree / x if x not in ("", ".") else tree)
+        except KeyError:
+            log.debug(f"`{x}` does not exist in `{name}`, not exporting it")
+
+    files = set()
+    written = 0
+    for root in roots:
+        objects = root.traverse() if root.type == "tree" else (root,)
+        for obj in objects:
+            target = path / obj.path
+            if obj.type != "blob":
+                # a file which became a directory
+                if target.is_symlink() or target.is_file():
+                    os.remove(target)
+                # submodules are not part of the object database; left empty, like an uninitialized submodule
+                if obj.type != "tree":
+                    target.mkdir(parents=True, exist_ok=True)
+                continue
+
+            files.add(target.relative_to(path))
+            if _blob(target) == (obj.hexsha, obj.mode):
+                continue
+
+            # a directory which became a file
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temp = target.with_name(f".{target.name}.sv-export")
+            if os.path.lexists(temp):
+                os.remove(temp)
+            if obj.mode == git.Blob.link_mode:
+                os.symlink(obj.data_stream.read().decode("utf8"), temp)
+            else:
+                with open(temp, "wb") as f:
+                    shutil.copyfileobj(obj.data_stream, f)
+                os.chmod(temp, 0o755 if obj.mode == git.Blob.executable_mode else 0o644)
+            os.replace(temp, target)
+            written += 1
+
+    deleted = 0
+    for dirpath, dirnames, filenames in os.walk(path, topdown=False):
+        relpath = pathlib.Path(dirpath).relative_to(path)
+        for filename in filenames:
+            if relpath / filename not in files:
+                os.remove(path / relpath / filename)
+                deleted += 1
+
+    log.debug(
+        f"exported `{name}` to {path}: {written} written, {deleted} deleted, {len(files) - written} unchanged"
+    )
+    return {"written": written, "deleted": deleted, "unchanged": len(files) - written}
+
 
 class PseudoBranch:
     """Class to generate a branch/pseudo-branch for git detached head/commit.
@@ -27,6 +132,37 @@ class PseudoBranch:
     pass
 
 
+class Ref:
+    """Branch or tag of the repository, as discovered by :class:`GitVersions`.
+
+    Parameters
+    ----------
+    name : :class:`str`
+        Name of the branch/tag.
+    kind : :class:`str`
+        ``branch`` or ``tag``.
+    hexsha : :class:`str`
+        Sha of the commit it points to.
+    tree : :class:`str`
+        Sha of the tree of that commit.
+    date : :class:`int`
+        Commit date, as a unix timestamp.
+    """
+
+    def __init__(self, name: str, kind: str, hexsha: str, tree: str, date: int) -> None:
+        self.name = name
+        self.kind = kind
+        self.hexsha = hexsha
+        self.tree = tree
+        self.date = date
+        return
+
+    def __repr__(self) -> str:
+        return self.name
+
+    pass
+
+
 class _BranchTag(ABC):
     """Abstract base class for getting relative paths of branches and tags as properties."""
 
@@ -72,12 +208,35 @@ class GitVersions(_BranchTag):
     force_branches : :class:`bool`
         This option allows `GitVersions` to treat the detached commits as normal branches.
         Use this option to build docs for detached head/commits.
+    cache_dir : :class:`str`
+        Directory to cache the discovered branches/tags in. Default is the build directory.
     """
 
-    def __init__(self, git_root: str, build_directory: str, force_branches: bool) -> None:
+    # Cache of the discovered branches/tags, kept out of the git directory, which may be read-only
+    REFS_CACHE_FILENAME = ".sphinx-versioned-refs.json"
+    # Fields of `git for-each-ref`; the ones prefixed with `*` are those of the commit an annotated tag
+    # points to.
+    _REF_FORMAT = "%00".join(
+        [
+            "%(refname)",
+            "%(objecttype)",
+            "%(objectname)",
+            "%(tree)",
+            "%(committerdate:unix)",
+            "%(*objecttype)",
+            "%(*objectname)",
+            "%(*tree)",
+            "%(*committerdate:unix)",
+        ]
+    )
+
+    def __init__(
+        self, git_root: str, build_directory: str, force_branches: bool, cache_dir: str = None
+    ) -> None:
         self.git_root = git_root
         self.build_directory = pathlib.Path(build_directory)
         self.force_branches = force_branches
+        self.cache_dir = pathlib.Path(cache_dir) if cache_dir else self.build_directory
 
         # for detached head
         self._active_branch = None
@@ -107,8 +266,11 @@ class GitVersions(_BranchTag):
         -------
         :class:`bool`
         """
-        self._raw_branches = self.repo.branches
-        self._raw_tags = self.repo.tags
+        refs = self._discover_refs()
+        self._raw_branches = [x for x in refs if x.kind == "branch"]
+        self._raw_tags = [x for x in refs if x.kind == "tag"]
+        # git resolves ambiguous names to the tag
+        self._refs = {x.name: x for x in [*self._raw_branches, *self._raw_tags]}
         self._branches = {x.name: self.build_directory / x.name for x in self._raw_branches}
         self._tags = {x.name: self.build_directory / x.name for x in self._raw_tags}
         self.all_versions = [*self._raw_tags, *self._raw_branches]
@@ -123,6 +285,71 @@ class GitVersions(_BranchTag):
         log.debug(f"Found versions: {[x.name for x in self.all_versions]}")
         return True
 
+    def _refs_key(self) -> dict:
+        """Modification times of ``packed-refs`` and of the directories of the loose branches/tags; git
+        replaces a ref by renaming a new file over it, so any change to the refs changes one of them.
+        """
+        common_dir = pathlib.Path(self.repo.common_dir)
+        key = {}
+        if (common_dir / "packed-refs").exists():
+            key["packed-refs"] = (common_dir / "packed-refs").stat().st_mtime_ns
+
+        for kind in ("heads", "tags"):
+            for dirpath, _, _ in os.walk(common_dir / "refs" / kind):
+                key[pathlib.Path(dirpath).relative_to(common_dir).as_posix()] = os.stat(dirpath).st_mtime_ns
+        return key
+
+    def _discover_refs(self) -> list:
+        """Discover all branches and tags in a single ``git for-each-ref``, or load them from the cache in
+        ``cache_dir`` if the refs didn't change since.
+
+        Returns
+        -------
+        :class:`list`
+            :class:`Ref` of every branch and tag pointing to a commit.
+        """
+        cache = self.cache_dir / self.REFS_CACHE_FILENAME
+        key = self._refs_key()
+        try:
+            with open(cache, "r", encoding="utf8") as f:
+                data = json.load(f)
+            if data["key"] == key:
+                log.debug(f"loaded refs from {cache}")
+                return [Ref(*x) for x in data["refs"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        refs = []
+        output = self.repo.git.for_each_ref(f"--format={self._REF_FORMAT}", "refs/heads", "refs/tags")
+        for line in output.splitlines():
+            refname, objecttype, *fields = line.split("\0")
+            if objecttype == "tag":
+                objecttype, hexsha, tree, date = fields[3:]
+            else:
+                hexsha, tree, date = fields[:3]
+
+            kind, name = (
+                ("branch", refname[11:]) if refname.startswith("refs/heads/") else ("tag", refname[10:])
+            )
+            if objecttype != "commit":
+                # e.g. a tag of a tag
+                try:
+                    commit = self.repo.commit(refname)
+                except (git.BadName, ValueError):
+                    log.debug(f"skipping `{name}`, which does not point to a commit")
+                    continue
+                hexsha, tree, date = commit.hexsha, commit.tree.hexsha, commit.committed_date
+
+            refs.append(Ref(name, kind, hexsha, tree, int(date)))
+
+        try:
+            with open(cache, "w", encoding="utf8") as f:
+                json.dump({"key": key, "refs": [[x.name, x.kind, x.hexsha, x.tree, x.date] for x in refs]}, f)
+        except OSError as err:
+            # e.g. a read-only git directory
+            log.debug(f"can't cache the refs: {err}")
+        return refs
+
     def checkout(self, name, *args, **kwargs) -> bool:
         """git checkout the branch/tag with its ``name``.
 
@@ -135,6 +362,87 @@ class GitVersions(_BranchTag):
         log.debug(f"git checkout branch/tag: `{name}`")
         return self.repo.git.checkout(name, *args, **kwargs)
 
+    def export(self, name: str, path: pathlib.Path, paths: list = None) -> dict:
+        """Write the tree of the branch/tag ``name`` into ``path`` without checking it out.
+        See :func:`sphinx_versioned.versions.export_tree`.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            Name of the branch/tag.
+        path : :class:`pathlib.Path`
+            Directory to export to.
+        paths : :class:`list`
+            Only export these paths, relative to the repository root. Default is the whole tree.
+
+        Returns
+        -------
+        :class:`dict`
+        """
+        return export_tree(self.repo, name, path, paths)
+
+    def prune_worktrees(self) -> None:
+        """Forget about the git worktrees whose directory has been removed."""
+        self.repo.git.worktree("prune")
+        return
+
+    def hexsha(self, name: str) -> str:
+        """Resolve the commit sha the branch/tag ``name`` points to.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            Name of the branch/tag.
+
+        Returns
+        -------
+        :class:`str`
+            Commit sha or `None`, if ``name`` can't be resolved.
+        """
+        if name in self._refs:
+            return self._refs[name].hexsha
+
+        try:
+            return self.repo.commit(name).hexsha
+        except (git.BadName, ValueError):
+            return None
+
+    def tree(self, name: str, paths: list = None) -> str:
+        """Resolve the sha of the git tree of the commit the branch/tag ``name`` points to.
+
+        Branches/tags pointing to different commits with the same content share their tree.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            Name of the branch/tag.
+        paths : :class:`list`
+            Only consider these paths, relative to the repository root. Default is the whole tree.
+
+        Returns
+        -------
+        :class:`str`
+            Tree sha, a hash of the shas of ``paths``, or `None` if ``name`` can't be resolved.
+        """
+        if not paths and name in self._refs:
+            return self._refs[name].tree
+
+        try:
+            tree = self.repo.commit(name).tree
+        except (git.BadName, ValueError):
+            return None
+
+        if not paths:
+            return tree.hexsha
+
+        shas = []
+        for x in paths:
+            try:
+                shas.append(f"{x}:{(tree / x).hexsha}")
+            except KeyError:
+                shas.append(f"{x}:")
+        return hashlib.sha1("\n".join(shas).encode("utf8")).hexdigest()
+
     @property
     def active_branch(self, *args, **kwargs):
         """Property to get the currently active branch."""
@@ -150,6 +458,261 @@ class GitVersions(_BranchTag):
     pass
 
 
+class IsolatedCheckout:
+    """Context manager which checks out a branch/tag into a private ``git worktree``.
+
+    Unlike :meth:`GitVersions.checkout`, the working tree, index and ``HEAD`` of the repository are
+    left untouched, which allows several versions to be checked out at the same time.
+    By default, the worktree lives inside a :class:`~sphinx_versioned.lib.TempDir` and is removed on exit.
+    If a ``path`` is given, the worktree is kept there instead and re-used on the next checkout; git then
+    only rewrites the files which differ, which keeps the paths and modification times of the sources
+    stable for sphinx's incremental builds. Files which are not part of the checked out tree are removed.
+
+    With ``export``, the tree is exported from the object database with :func:`export_tree` instead of being
+    checked out into a worktree; nothing is registered in the repository and no lock is needed.
+    With ``paths``, only these paths are exported, with or without ``export``; a sparse checkout of a worktree
+    would turn on ``extensions.worktreeConfig`` in the configuration of the repository for good.
+
+    Parameters
+    ----------
+    git_root : :class:`str`
+        Path to the working tree of the git repository.
+    name : :class:`str`
+        Name of the branch/tag/commit to check out.
+    lock : :class:`multiprocessing.Lock`
+        Lock shared between processes; git does not support adding/removing worktrees concurrently.
+    path : :class:`pathlib.Path`
+        Location of a persistent worktree. Default is a temporary directory.
+    export : :class:`bool`
+        Export the tree instead of adding a worktree.
+    paths : :class:`list`
+        Only export these paths, relative to the repository root. Default is the whole tree.
+    """
+
+    def __init__(
+        self,
+        git_root: str,
+        name: str,
+        lock=None,
+        path: pathlib.Path = None,
+        export: bool = False,
+        paths: list = None,
+    ) -> None:
+        self.git_root = git_root
+        self.name = name
+        self.lock = lock if lock else contextlib.nullcontext()
+        self.persistent = path is not None
+        self.path = pathlib.Path(path) if path else None
+        self.export = export
+        self.paths = paths
+        return
+
+    def __enter__(self) -> pathlib.Path:
+        """Add (or update the persistent) worktree and return its path."""
+        self.repo = git.Repo(self.git_root)
+
+        if self.export or self.paths:
+            if not self.persistent:
+                self._temp_dir = TempDir()
+                self.path = pathlib.Path(self._temp_dir.name)
+            export_tree(self.repo, self.name, self.path, self.paths)
+            return self.path
+
+        if self.persistent and (self.path / ".git").is_file():
+            log.debug(f"git checkout `{self.name}` in worktree {self.path}")
+            worktree = git.Git(str(self.path))
+            worktree.checkout("--detach", "--force", self.name)
+            # untracked and ignored files of the previous version, e.g. generated sources, would be read by
+            # sphinx; the doctrees and the output live outside of the worktree
+            worktree.clean("-ffdx")
+            return self.path
+
+        if self.persistent:
+            # leftovers of a worktree which git no longer knows about, or of an export
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            self._temp_dir = TempDir()
+            # git names the worktree's admin directory after its basename; keep it unique.
+            self.path = pathlib.Path(self._temp_dir.name) / pathlib.Path(self._temp_dir.name).name
+
+        log.debug(f"git worktree add `{self.name}` at {self.path}")
+        with self.lock:
+            if self.persistent:
+                self.repo.git.worktree("prune")
+            self.repo.git.worktree("add", "--detach", str(self.path), self.name)
+        return self.path
+
+    def __exit__(self, *_) -> None:
+        """Remove the worktree and its temporary directory, unless it's persistent."""
+        try:
+            if not self.persistent and not self.export and not self.paths:
+                with self.lock:
+                    self.repo.git.worktree("remove", "--force", str(self.path))
+        finally:
+            if not self.persistent:
+                self._temp_dir.cleanup()
+            self.repo.close()
+        return
+
+    pass
+
+
+class WorktreePool:
+    """Pool of persistent ``git worktree`` checkouts, re-used for the builds of several versions and runs.
+
+    The pool holds at most ``size`` worktrees, the slots, in ``path``. Every version is assigned to a slot, in
+    which it is checked out with :class:`IsolatedCheckout`; git then only rewrites the files which differ from
+    the version checked out before. Versions are ordered by their commit date and adjacent versions are put on
+    the same slot, to keep these differences small. The assignment is stored in ``path`` and a version keeps
+    its slot on later runs, so that the source directory of its sphinx environment doesn't change.
+
+    Parameters
+    ----------
+    git_root : :class:`str`
+        Path to the working tree of the git repository.
+    path : :class:`pathlib.Path`
+        Directory of the pool.
+    size : :class:`int`
+        Maximum number of worktrees.
+    """
+
+    STATE_FILENAME = "pool.json"
+
+    def __init__(self, git_root: str, path: pathlib.Path, size: int) -> None:
+        self.git_root = git_root
+        self.path = pathlib.Path(path)
+        self.size = max(size, 1)
+        self._assigned = self._load()
+        return
+
+    def _load(self) -> dict:
+        """Load the slots the versions were assigned to on the previous run."""
+        try:
+            with open(self.path / self.STATE_FILENAME, "r", encoding="utf8") as f:
+                assigned = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {x: y for x, y in assigned.items() if isinstance(y, int) and 0 <= y < self.size}
+
+    def _save(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / self.STATE_FILENAME, "w", encoding="utf8") as f:
+            json.dump(self._assigned, f, indent=2, sort_keys=True)
+        return
+
+    def slot(self, index: int) -> pathlib.Path:
+        """Path of the worktree of the slot ``index``."""
+        return self.path / str(index)
+
+    def _order(self, names: list, dates: dict) -> list:
+        """Sort ``names`` by the date of their commits; those missing in ``dates`` are looked up."""
+        with git.Repo(self.git_root) as repo:
+
+            def date(name):
+                if name in dates:
+                    return dates[name]
+                try:
+                    return repo.commit(name).committed_date
+                except (git.BadName, ValueError):
+                    return 0
+
+            return sorted(names, key=lambda x: (date(x), x))
+
+    def assign(self, names: list, dates: dict = None, weights: dict = None) -> list:
+        """Assign the versions ``names`` to the slots of the pool.
+
+        Versions keep the slot they were assigned to before. Every other version goes to the slot of its
+        closest neighbour by commit date, unless that slot already holds its share of the versions; then to
+        the slot holding the fewest versions.
+
+        Parameters
+        ----------
+        names : :class:`list`
+            Names of the versions.
+        dates : :class:`dict`
+            Commit dates of the versions, if known. See :class:`Ref`.
+        weights : :class:`dict`
+            Expected build durations of the versions, see
+            :func:`sphinx_versioned.schedule.expected_durations`. The slots are then balanced by the sum of
+            their durations, instead of their number of versions, and the longest versions are assigned first.
+
+        Returns
+        -------
+        :class:`list`
+            For every slot, the names of the versions assigned to it, ordered by commit date.
+        """
+        order = self._order(names, dates or {})
+        position = {x: i for i, x in enumerate(order)}
+        weight = (lambda x: weights.get(x) or 1) if weights else (lambda x: 1)
+        share = sum(weight(x) for x in order) / self.size if weights else -(-len(order) // self.size)
+
+        slots = [[] for _ in range(self.size)]
+        load = [0] * self.size
+        assigned = {x: self._assigned[x] for x in order if x in self._assigned}
+        for name, index in assigned.items():
+            slots[index].append(name)
+            load[index] += weight(name)
+
+        pending = [x for x in order if x not in assigned]
+        if weights:
+            pending.sort(key=lambda x: -weight(x))
+
+        for name in pending:
+            i = position[name]
+            # closest neighbour which has a slot, the older one first
+            neighbours = [
+                order[y]
+                for x in range(1, len(order))
+                for y in (i - x, i + x)
+                if 0 <= y < len(order) and order[y] in assigned
+            ]
+            index = assigned[neighbours[0]] if neighbours else None
+            if index is None or load[index] + weight(name) > share:
+                index = min(range(self.size), key=lambda x: load[x])
+            assigned[name] = index
+            slots[index].append(name)
+            load[index] += weight(name)
+
+        self._assigned.update(assigned)
+        self._save()
+
+        log.debug(f"worktree pool: {dict(enumerate(slots))}")
+        return [sorted(x, key=order.index) for x in slots]
+
+    def prune(self) -> int:
+        """Remove the worktrees of the slots exceeding the size of the pool, e.g. after lowering ``jobs``.
+
+        Returns
+        -------
+        :class:`int`
+            Number of removed worktrees.
+        """
+        removed = 0
+        if not self.path.is_dir():
+            return removed
+
+        with git.Repo(self.git_root) as repo:
+            for path in self.path.iterdir():
+                if not path.is_dir() or (path.name.isdigit() and int(path.name) < self.size):
+                    continue
+
+                log.debug(f"removing worktree {path} from the pool")
+                try:
+                    repo.git.worktree("remove", "--force", str(path))
+                except git.GitCommandError:
+                    shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+
+            repo.git.worktree("prune")
+
+        self._assigned = {x: y for x, y in self._assigned.items() if y < self.size}
+        self._save()
+        return removed
+
+    pass
+
+
 class BuiltVersions(_BranchTag):
     """Handles versions to build. Builds upon the abstract base class :class:`sphinx_versioned.versions._BranchTag`.
 
@@ -171,19 +734,67 @@ class BuiltVersions(_BranchTag):
         self._parse()
         return
 
+    def as_dict(self) -> dict:
+        """Get the tags and branches with their ``index.html`` location relative to the build directory.
+
+        Returns
+        -------
+        :class:`dict`
+        """
+        return {
+            "tags": {
+                x: (y.relative_to(self.build_directory) / "index.html").as_posix()
+                for x, y in self._tags.items()
+            },
+            "branches": {
+                x: (y.relative_to(self.build_directory) / "index.html").as_posix()
+                for x, y in self._branches.items()
+            },
+        }
+
+    def __getstate__(self) -> dict:
+        """Drop the git references, bound to a :class:`git.Repo`, when pickling for worker processes."""
+        state = self.__dict__.copy()
+        state["_versions"] = [x.name for x in self._versions]
+        state["_raw_tags"] = [x.name for x in self._raw_tags]
+        state["_raw_branches"] = [x.name for x in self._raw_branches]
+        return state
+
     def _parse(self) -> bool:
         """Parse raw branches/tags in :class:`~sphinx_versioned.versions.GitVersions` instance into separate variables."""
         self._raw_tags = []
         self._raw_branches = []
 
         for tag in self._versions:
-            if isinstance(tag, git.TagReference):
+            if getattr(tag, "kind", None) == "tag":
                 self._raw_tags.append(tag)
             else:
                 self._raw_branches.append(tag)
 
         self._branches = {x.name: self.build_directory / x.name for x in self._raw_branches}
         self._tags = {x.name: self.build_directory / x.name for x in self._raw_tags}
+        # resolve the relative paths once; they are read for every page of every version
+        self._resolved = {"tags": super().tags, "branches": super().branches}
         return True
 
+    @property
+    def branches(self) -> types.MappingProxyType:
+        """Get the branches and its ``index.html`` location, resolved once by :meth:`_parse`.
+
+        Returns
+        -------
+        :class:`types.MappingProxyType`
+        """
+        return types.MappingProxyType(self._resolved["branches"])
+
+    @property
+    def tags(self) -> types.MappingProxyType:
+        """Get the tags and its ``index.html`` location, resolved once by :meth:`_parse`.
+
+        Returns
+        -------
+        :class:`types.MappingProxyType`
+        """
+        return types.MappingProxyType(self._resolved["tags"])
+
     pass
@@ -0,0 +1,16 @@
+import os
+import pathlib
+
+from sphinx_versioned.versions import GitVersions
+
+
+def main(path):
+    """Make the cache of the refs in the output directory unwritable."""
+    cache = pathlib.Path(path) / "docs" / "_build" / GitVersions.REFS_CACHE_FILENAME
+    cache.unlink(missing_ok=True)
+    cache.mkdir(parents=True)
+    return True
+
+
+if __name__ == "__main__":
+    main(os.getcwd())
@@ -5,7 +5,7 @@ import pathlib
 
 def main(path):
     """
-    Method to cleanup `.git` and `docs` directory for setting up testing infrastructure.
+    Method to cleanup `.git`, `docs` and `.cache` directory for setting up testing infrastructure.
 
     path : `str`
         CWD.
@@ -20,6 +20,10 @@ def main(path):
         shutil.rmtree(path / "docs")
         print(f"rmdir: {path / 'docs'}")
 
+    if (path / ".cache").exists():
+        shutil.rmtree(path / ".cache")
+        print(f"rmdir: {path / '.cache'}")
+
     return True
 
 
@@ -0,0 +1,18 @@
+import os
+import pathlib
+
+
+def main(path):
+    """Leave an untracked source in every worktree of the pool, like a generated file of a previous build."""
+    path = pathlib.Path(path)
+    worktrees = [x for x in (path / ".cache" / "worktrees").iterdir() if (x / "docs").is_dir()]
+    assert worktrees
+
+    for worktree in worktrees:
+        with open(worktree / "docs" / "stale_generated.rst", "w") as f:
+            f.write("Stale\n=====\n\nGenerated by the build of another version.\n")
+    return True
+
+
+if __name__ == "__main__":
+    main(os.getcwd())
@@ -0,0 +1,41 @@
+import os
+import sys
+import json
+import signal
+import pathlib
+import subprocess
+
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+JOURNAL = OUTPATH / ".sphinx-versioned-journal.json"
+
+
+def main():
+    # Kill `sphinx-versioned` while sphinx builds the second version, i.e. with the working tree checked out
+    proc = subprocess.Popen(
+        ["sphinx-versioned", "--no-quite", "--log=debug", "--no-prebuild"] + sys.argv[1:],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        text=True,
+    )
+    builds = 0
+    for line in proc.stdout:
+        print(line, end="")
+        builds += line.startswith("Running Sphinx")
+        if builds == 2:
+            proc.send_signal(signal.SIGKILL)
+            break
+    proc.wait()
+    assert builds == 2
+
+    with open(JOURNAL, "r", encoding="utf8") as f:
+        journal = json.load(f)
+    journal["mtimes"] = {x: (OUTPATH / x / "index.html").stat().st_mtime for x in journal["published"]}
+
+    with open("interrupted.json", "w", encoding="utf8") as f:
+        json.dump(journal, f)
+    return True
+
+
+if __name__ == "__main__":
+    main()
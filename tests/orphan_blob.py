@@ -0,0 +1,23 @@
+import os
+import hashlib
+import pathlib
+
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+
+
+def main(path):
+    """Store a file which no version uses anymore, as left by a version removed since the last build."""
+    data = b"not used by any version"
+    digest = hashlib.sha256(data).hexdigest()
+    stored = OUTPATH / ".store" / digest[:2] / digest
+    stored.parent.mkdir(parents=True, exist_ok=True)
+    with open(stored, "wb") as f:
+        f.write(data)
+
+    with open(pathlib.Path(path) / "orphan.txt", "w", encoding="utf8") as f:
+        f.write(digest)
+    return True
+
+
+if __name__ == "__main__":
+    main(os.getcwd())
@@ -0,0 +1,41 @@
+import os
+import sys
+import git
+import pathlib
+
+
+def fix(path):
+    """Move the broken tag to the fixed `main`."""
+    repo = git.Repo(path)
+    repo.create_tag("v3.0", ref="main", force=True)
+    return True
+
+
+def main(path):
+    path = pathlib.Path(path)
+    basepath = path / "docs"
+    repo = git.Repo(path)
+
+    with open(basepath / "conf.py", "r") as f:
+        conf = f.read()
+
+    # Tag a version whose `conf.py` fails to load
+    with open(basepath / "conf.py", "a") as f:
+        f.write("raise RuntimeError('broken conf.py')\n")
+    repo.git.add(basepath / "conf.py")
+    repo.index.commit("Broke `conf.py`")
+    repo.create_tag("v3.0")
+
+    # and fix it again on `main`
+    with open(basepath / "conf.py", "w") as f:
+        f.write(conf)
+    repo.git.add(basepath / "conf.py")
+    repo.index.commit("Fixed `conf.py`")
+    return True
+
+
+if __name__ == "__main__":
+    if "--fix" in sys.argv:
+        fix(os.getcwd())
+    else:
+        main(os.getcwd())
@@ -0,0 +1,21 @@
+import os
+import pathlib
+
+
+def main(path):
+    """Add files outside of `docs` to the repository, before it's committed: a package documented by the docs
+    and assets which aren't needed to build them.
+    """
+    path = pathlib.Path(path)
+    (path / "src" / "package").mkdir(parents=True, exist_ok=True)
+    with open(path / "src" / "package" / "__init__.py", "w") as f:
+        f.write('"""Package documented by the docs."""\n')
+
+    (path / "assets").mkdir(parents=True, exist_ok=True)
+    with open(path / "assets" / "large.bin", "wb") as f:
+        f.write(os.urandom(1 << 16))
+    return True
+
+
+if __name__ == "__main__":
+    main(os.getcwd())
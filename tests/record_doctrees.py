@@ -0,0 +1,21 @@
+import os
+import json
+import pathlib
+
+CACHEPATH = pathlib.Path(os.getcwd()) / ".cache"
+
+
+def main(path):
+    """Record the modification time of the doctree of every document of every version in the cache, which
+    sphinx only writes when it reads the document."""
+    path = pathlib.Path(path)
+    mtimes = {x.relative_to(CACHEPATH).as_posix(): x.stat().st_mtime_ns for x in CACHEPATH.rglob("*.doctree")}
+    assert mtimes
+
+    with open(path / "doctrees.json", "w", encoding="utf8") as f:
+        json.dump(mtimes, f)
+    return True
+
+
+if __name__ == "__main__":
+    main(os.getcwd())
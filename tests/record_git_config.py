@@ -0,0 +1,14 @@
+import os
+import shutil
+import pathlib
+
+
+def main(path):
+    """Record the configuration of the git repository, to compare after the builds."""
+    path = pathlib.Path(path)
+    shutil.copyfile(path / ".git" / "config", path / "git-config.orig")
+    return True
+
+
+if __name__ == "__main__":
+    main(os.getcwd())
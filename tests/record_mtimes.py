@@ -0,0 +1,26 @@
+import os
+import json
+import pathlib
+
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+
+
+def main(path):
+    """Record the modification time of every published file of every version, to compare after another run."""
+    path = pathlib.Path(path)
+    mtimes = {
+        x.relative_to(OUTPATH).as_posix(): x.stat().st_mtime_ns
+        for version in OUTPATH.iterdir()
+        if version.is_dir()
+        for x in version.rglob("*")
+        if x.is_file()
+    }
+    assert mtimes
+
+    with open(path / "mtimes.json", "w", encoding="utf8") as f:
+        json.dump(mtimes, f)
+    return True
+
+
+if __name__ == "__main__":
+    main(os.getcwd())
@@ -0,0 +1,30 @@
+import os
+import pytest
+import pathlib
+from bs4 import BeautifulSoup as bs
+
+VERSIONS_SUPPOSED = {
+    "v1.0": [
+        "index.html",
+    ],
+    "v2.0": ["index.html", "example.html", "code_ref/api_ref/example2.html"],
+    "main": ["index.html", "example.html", "code_ref/api_ref/example2.html"],
+}
+
+BASEPATH = pathlib.Path(os.getcwd()) / "docs"
+OUTPATH = BASEPATH / "_build"
+
+
+@pytest.mark.parametrize("ver, file", [(x, z) for x, y in VERSIONS_SUPPOSED.items() for z in y])
+def test_current_version(ver, file):
+    # `main` and `v2.0` point to the same commit; `main` is copied from `v2.0` and must not show `v2.0`
+    with open(OUTPATH / ver / file, encoding="utf8") as f:
+        soup = bs(f.read(), features="html.parser")
+
+    injected_code = soup.find_all(class_="injected")
+    assert injected_code
+    for inj in injected_code:
+        assert f"v: {ver}" in inj.find(class_="rst-current-version").text
+        current = inj.find_all(class_="rtd-current-item")
+        assert [x.text.strip() for x in current] == [ver]
+    return
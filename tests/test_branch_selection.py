@@ -4,7 +4,7 @@ import pathlib
 from bs4 import BeautifulSoup as bs
 from sphinx_versioned.build import VersionedDocs
 from sphinx_versioned.lib import parse_branch_selection
-
+from sphinx_versioned.selection import VersionSelector
 
 VERSIONS_SUPPOSED = {
     "v1.0": [
@@ -65,6 +65,66 @@ def test_parse_branch_selection_regex(branches, select, exclude):
     return
 
 
+@pytest.mark.parametrize(
+    "version_range, latest_minors, select, exclude",
+    [
+        (">=2.0", None, ["main", "v2.0"], ["v1.0"]),
+        ("<2", None, ["main", "v1.0"], ["v2.0"]),
+        (None, 1, ["main", "v2.0"], ["v1.0"]),
+        (">=1.0, <3", 2, ["main", "v1.0", "v2.0"], []),
+    ],
+)
+def test_version_rules(version_range, latest_minors, select, exclude):
+    ver = VersionedDocs(
+        {
+            "chdir": ".",
+            "output_dir": OUTPATH,
+            "git_root": BASEPATH.parent,
+            "local_conf": "docs/conf.py",
+            "select_branches": None,
+            "exclude_branches": None,
+            "version_range": version_range,
+            "latest_minors": latest_minors,
+            "main_branch": "main",
+            "quite": False,
+            "verbose": True,
+            "force_branches": True,
+        },
+        debug=True,
+    )
+    _names_versions_to_pre_build = [x.name for x in ver._versions_to_pre_build]
+    assert sorted(_names_versions_to_pre_build) == sorted(select)
+    for tag in exclude:
+        assert tag not in _names_versions_to_pre_build
+    return
+
+
+@pytest.mark.parametrize(
+    "kwargs, selected",
+    [
+        ({"select": ["main", "v*"], "exclude": ["v1*"]}, ["main", "v2.0.0", "v2.1.0", "v2.1.1rc1", "v3.0"]),
+        (
+            {"select": ["v3*", "main", "v*"]},
+            ["v3.0", "main", "v1.0", "v1.1", "v2.0.0", "v2.1.0", "v2.1.1rc1"],
+        ),
+        ({"version_range": ">=1.1,<3"}, ["main", "dev", "v1.1", "v2.0.0", "v2.1.0", "v2.1.1rc1"]),
+        ({"latest_minors": 2}, ["main", "dev", "v2.1.0", "v3.0"]),
+        ({"latest_majors": 2, "version_range": "<3"}, ["main", "dev", "v1.1", "v2.1.0"]),
+    ],
+)
+def test_version_selector(kwargs, selected):
+    names = ["main", "dev", "v1.0", "v1.1", "v2.0.0", "v2.1.0", "v2.1.1rc1", "v3.0"]
+    assert VersionSelector(**kwargs).select(names) == selected
+    return
+
+
+def test_version_selector_missing():
+    selector = VersionSelector(["v*", "v1.0", "x*", "main"])
+    selector.select(["main", "v1.0"])
+    assert selector.missing == ["x*"]
+    return
+
+
 def test_top_level_index():
     assert OUTPATH.exists()
     assert (OUTPATH / "index.html").is_file()
@@ -76,9 +136,11 @@ def test_branch_selection():
     versions_should_exist = list(VERSIONS_SUPPOSED.keys())
     # `versions_should_exist` plus top-level index.html
     versions_should_exist.append("index.html")
-    # get files and folders in the outpath
+    # get files and folders in the outpath, except the state kept there, e.g. `.sphinx-versioned-history.json`
     outpath_glob = OUTPATH.glob("*")
     for filefolder in outpath_glob:
+        if filefolder.name.startswith("."):
+            continue
         assert filefolder.name in versions_should_exist
     return
 
@@ -0,0 +1,35 @@
+import os
+import json
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+
+CACHEPATH = pathlib.Path(os.getcwd()) / ".cache"
+
+with open(pathlib.Path(os.getcwd()) / "doctrees.json", encoding="utf8") as f:
+    DOCTREES = json.load(f)
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_doctrees_cached(ver):
+    assert [x for x in DOCTREES if x.startswith(f"{ver}/")]
+    return
+
+
+@pytest.mark.parametrize("doctree", sorted(DOCTREES))
+def test_unchanged_documents_not_read(doctree):
+    # the second run re-uses the cached environment; sphinx rewrites the doctree of every document it reads
+    assert (CACHEPATH / doctree).stat().st_mtime_ns == DOCTREES[doctree]
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_second_run_reported(ver):
+    # the versions were built by sphinx again, not skipped
+    with open(pathlib.Path(os.getcwd()) / "report.json", encoding="utf8") as f:
+        report = json.load(f)
+
+    assert report["versions"][ver]["status"] == "built"
+    assert "read" in report["versions"][ver]["prebuild"]
+    return
@@ -0,0 +1,36 @@
+import os
+import gzip
+import brotli
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+MIN_SIZE = 1024
+
+
+def _text_files(ver):
+    return [x for x in (OUTPATH / ver).rglob("*") if x.suffix in (".html", ".css", ".js") and x.is_file()]
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_compressed_siblings(ver):
+    files = [x for x in _text_files(ver) if x.stat().st_size >= MIN_SIZE]
+    assert files
+    for path in files:
+        gz = path.with_name(f"{path.name}.gz")
+        br = path.with_name(f"{path.name}.br")
+        assert gzip.decompress(gz.read_bytes()) == path.read_bytes()
+        assert brotli.decompress(br.read_bytes()) == path.read_bytes()
+        # up-to-date siblings share the modification time of their file
+        assert gz.stat().st_mtime_ns == br.stat().st_mtime_ns == path.stat().st_mtime_ns
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_small_files_not_compressed(ver):
+    for path in _text_files(ver):
+        if path.stat().st_size < MIN_SIZE:
+            assert not path.with_name(f"{path.name}.gz").exists()
+            assert not path.with_name(f"{path.name}.br").exists()
+    return
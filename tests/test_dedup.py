@@ -0,0 +1,55 @@
+import os
+import hashlib
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+STOREPATH = OUTPATH / ".store"
+
+
+def _sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _files():
+    return [x for ver in VERSIONS_SUPPOSED for x in (OUTPATH / ver).rglob("*") if x.is_file()]
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_files_linked_to_store(ver):
+    files = [x for x in (OUTPATH / ver).rglob("*") if x.is_file()]
+    assert files
+    for path in files:
+        stored = STOREPATH / _sha256(path)[:2] / _sha256(path)
+        # every file is a hardlink to the stored copy of its content
+        assert path.stat().st_nlink > 1
+        assert os.path.samefile(path, stored)
+    return
+
+
+def test_identical_files_share_inode():
+    inodes = {}
+    for path in _files():
+        inodes.setdefault(_sha256(path), set()).add(path.stat().st_ino)
+
+    assert all(len(x) == 1 for x in inodes.values())
+
+    # e.g. the static files of the theme, the same in every version
+    jquery = [x for x in _files() if x.name == "jquery.js"]
+    assert len(jquery) == len(VERSIONS_SUPPOSED)
+    assert len({x.stat().st_ino for x in jquery}) == 1
+    return
+
+
+def test_prune_keeps_referenced_files():
+    stored = {x.name for x in STOREPATH.glob("*/*")}
+    assert {_sha256(x) for x in _files()} <= stored
+
+    # every stored file is still used by a version, the orphan one is removed
+    assert all(x.stat().st_nlink > 1 for x in STOREPATH.glob("*/*"))
+    with open(pathlib.Path(os.getcwd()) / "orphan.txt", encoding="utf8") as f:
+        assert f.read() not in stored
+    return
@@ -0,0 +1,52 @@
+import os
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+
+CACHEPATH = pathlib.Path(os.getcwd()) / ".cache"
+
+
+def _worktrees():
+    worktrees = [x for x in (CACHEPATH / "worktrees").iterdir() if x.is_dir()]
+    assert worktrees
+    return worktrees
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_included_paths_exported(ver):
+    export = CACHEPATH / ver / "export"
+    assert (export / "docs" / "conf.py").is_file()
+    assert (export / "src" / "package" / "__init__.py").is_file()
+    assert not (export / "assets").exists()
+    return
+
+
+def test_included_paths_checked_out():
+    # the included paths are exported into the pool's slots instead of checking out worktrees
+    for worktree in _worktrees():
+        assert (worktree / "docs" / "conf.py").is_file()
+        assert (worktree / "src" / "package" / "__init__.py").is_file()
+        assert not (worktree / "assets").exists()
+        assert not (worktree / ".git").exists()
+    return
+
+
+def test_git_config_unchanged():
+    # neither the pool nor `--include` leave anything behind in the configuration of the repository
+    cwd = pathlib.Path(os.getcwd())
+    with open(cwd / "git-config.orig", encoding="utf8") as f:
+        expected = f.read()
+    with open(cwd / ".git" / "config", encoding="utf8") as f:
+        assert f.read() == expected
+    return
+
+
+def test_full_checkout_restored():
+    # a later run without `--include` checks out the whole tree in worktrees at the same paths
+    for worktree in _worktrees():
+        assert (worktree / ".git").is_file()
+        assert (worktree / "docs" / "conf.py").is_file()
+        assert (worktree / "src" / "package" / "__init__.py").is_file()
+        assert (worktree / "assets" / "large.bin").is_file()
+    return
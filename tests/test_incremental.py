@@ -0,0 +1,55 @@
+import os
+import git
+import json
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+
+BASEPATH = pathlib.Path(os.getcwd()) / "docs"
+OUTPATH = BASEPATH / "_build"
+MANIFEST = OUTPATH / ".sphinx-versioned.json"
+
+
+def test_manifest_exists():
+    assert MANIFEST.is_file()
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_manifest_records_versions(ver):
+    with open(MANIFEST, encoding="utf8") as f:
+        manifest = json.load(f)
+
+    assert "sphinx" in manifest["toolchain"]
+    record = manifest["versions"][ver]
+    assert record["hexsha"] == git.Repo(BASEPATH.parent).commit(ver).hexsha
+    assert record["config"]
+    assert record["versions"]
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_skipped_versions_are_kept(ver):
+    # the second run skips every version; their output must survive
+    assert (OUTPATH / ver / "index.html").is_file()
+
+    # untouched, as recorded before the second run
+    with open(pathlib.Path(os.getcwd()) / "mtimes.json", encoding="utf8") as f:
+        mtimes = {x: y for x, y in json.load(f).items() if x.startswith(f"{ver}/")}
+    assert mtimes
+    for file, mtime in mtimes.items():
+        assert (OUTPATH / file).stat().st_mtime_ns == mtime
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_skipped_versions_not_built(ver):
+    # neither pre-built nor built by the second run, see `--report`
+    with open(pathlib.Path(os.getcwd()) / "report.json", encoding="utf8") as f:
+        report = json.load(f)
+
+    assert report["versions"][ver]["status"] == "built"
+    assert "prebuild" not in report["versions"][ver]
+    assert "build" not in report["versions"][ver]
+    return
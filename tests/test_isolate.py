@@ -0,0 +1,36 @@
+import os
+import json
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+
+REPORT = pathlib.Path(os.getcwd()) / "report.json"
+TRACE = pathlib.Path(os.getcwd()) / "trace.json"
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_peak_rss(ver):
+    with open(REPORT, encoding="utf8") as f:
+        report = json.load(f)
+
+    # every version is built by a fresh worker process, so its peak is its own
+    assert report["versions"][ver]["peak_rss"] > 0
+    assert "process_peak_rss" not in report["versions"][ver]
+    return
+
+
+def test_recycled_workers():
+    with open(TRACE, encoding="utf8") as f:
+        trace = json.load(f)
+
+    # with `--isolate`, every version is built by its own worker process
+    workers = {}
+    for x in trace["traceEvents"]:
+        if x["ph"] == "X" and x["args"]["stage"] == "prebuild" and x["args"]["version"] in VERSIONS_SUPPOSED:
+            workers.setdefault(x["args"]["version"], set()).add(x["tid"])
+
+    assert set(workers) == set(VERSIONS_SUPPOSED)
+    assert all(len(x) == 1 for x in workers.values())
+    assert len(set.union(*workers.values())) == len(VERSIONS_SUPPOSED)
+    return
@@ -0,0 +1,51 @@
+import os
+import json
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+VERSION_BROKEN = "v3.0"
+
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+REPORT = pathlib.Path(os.getcwd()) / "report.json"
+
+
+def test_broken_version_not_published():
+    assert (OUTPATH / "index.html").is_file()
+    assert not (OUTPATH / VERSION_BROKEN).exists()
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_flyout_without_broken_version(ver):
+    with open(OUTPATH / ver / "index.html", encoding="utf8") as f:
+        data = f.read()
+
+    for other in VERSIONS_SUPPOSED:
+        assert f"{other}/index.html" in data
+    assert f"{VERSION_BROKEN}/index.html" not in data
+    return
+
+
+def test_failure_summary():
+    with open(REPORT, encoding="utf8") as f:
+        report = json.load(f)
+
+    failure = report["versions"][VERSION_BROKEN]
+    assert failure["status"] == "failed"
+    assert failure["stage"] == "build"
+    assert "sphinx-build exited" in failure["error"]
+    for ver in VERSIONS_SUPPOSED:
+        assert report["versions"][ver]["status"] == "built"
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED + [VERSION_BROKEN])
+def test_fixed_version_relinked(ver):
+    # once the broken version is fixed, the incremental build lists it in the flyout menu of every version
+    with open(OUTPATH / ver / "index.html", encoding="utf8") as f:
+        data = f.read()
+
+    for other in VERSIONS_SUPPOSED + [VERSION_BROKEN]:
+        assert f"{other}/index.html" in data
+    return
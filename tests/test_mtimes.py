@@ -0,0 +1,16 @@
+import os
+import json
+import pytest
+import pathlib
+
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+
+with open(pathlib.Path(os.getcwd()) / "mtimes.json", encoding="utf8") as f:
+    MTIMES = json.load(f)
+
+
+@pytest.mark.parametrize("file", sorted(MTIMES))
+def test_unchanged_files_kept(file):
+    # a second run with the same sources doesn't rewrite any published file
+    assert (OUTPATH / file).stat().st_mtime_ns == MTIMES[file]
+    return
@@ -0,0 +1,34 @@
+import os
+import json
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+
+
+def _report(run):
+    with open(pathlib.Path(os.getcwd()) / f"report{run}.json", encoding="utf8") as f:
+        return json.load(f)["versions"]
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_dummy_prebuild(ver):
+    # the `dummy` builder reads the sources, but has no html assets to copy, unlike the `html` builder
+    report = _report(1)[ver]
+    assert report["status"] == "built"
+    assert "read" in report["prebuild"]
+    assert "assets" not in report["prebuild"]
+    # its output can't be published, so the html is written by a second sphinx run
+    assert "write" in report["build"]
+    assert "assets" in report["build"]
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_cached_prebuild_skipped(ver):
+    # built before with the same content, config and toolchain
+    report = _report(2)[ver]
+    assert report["status"] == "built"
+    assert "prebuild" not in report
+    assert "write" in report["build"]
+    return
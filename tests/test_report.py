@@ -0,0 +1,66 @@
+import os
+import json
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = {
+    "v1.0": [
+        "index.html",
+    ],
+    "v2.0": ["index.html", "example.html", "code_ref/api_ref/example2.html"],
+    "main": ["index.html", "example.html", "code_ref/api_ref/example2.html"],
+}
+
+REPORT = pathlib.Path(os.getcwd()) / "report.json"
+TRACE = pathlib.Path(os.getcwd()) / "trace.json"
+
+
+@pytest.fixture(scope="module")
+def report():
+    with open(REPORT, encoding="utf8") as f:
+        return json.load(f)
+
+
+def test_report_phases(report):
+    assert report["wall"] > 0
+    for phase in ["refs", "selection", "checkout", "read", "write", "assets", "copy", "index"]:
+        assert phase in report["phases"]
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED.keys())
+def test_report_versions(report, ver):
+    version = report["versions"][ver]
+    assert version["status"] == "built"
+    assert version["pages"] >= len(VERSIONS_SUPPOSED[ver])
+    assert version["bytes"] > 0
+    # the first version of every worker of `--jobs 2` has its own peak memory, the others the one of
+    # the worker
+    assert version.get("peak_rss", 0) > 0 or version.get("process_peak_rss", 0) > 0
+    for phase in ["checkout", "read", "write", "assets"]:
+        assert version["prebuild"][phase] >= 0
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED.keys())
+def test_prebuild_published(report, ver):
+    # every version pre-built successfully, so its pre-build output is published without running sphinx again
+    assert list(report["versions"][ver]["build"]) == ["copy"]
+    return
+
+
+def test_trace():
+    with open(TRACE, encoding="utf8") as f:
+        trace = json.load(f)
+
+    spans = [x for x in trace["traceEvents"] if x["ph"] == "X"]
+    for ver in VERSIONS_SUPPOSED:
+        assert any(x["args"]["version"] == ver and x["args"]["stage"] == "prebuild" for x in spans)
+        # the build stage only copies the output of the pre-build
+        assert [
+            x["name"] for x in spans if x["args"]["version"] == ver and x["args"]["stage"] == "build"
+        ] == [f"{ver}: copy"]
+
+    # the main process and the workers of `--jobs 2` have their own tracks
+    assert len(set(x["tid"] for x in spans)) > 1
+    return
@@ -0,0 +1,43 @@
+import os
+import git
+import json
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+JOURNAL = OUTPATH / ".sphinx-versioned-journal.json"
+
+
+@pytest.fixture(scope="module")
+def interrupted():
+    with open(pathlib.Path(os.getcwd()) / "interrupted.json", encoding="utf8") as f:
+        return json.load(f)
+
+
+def test_interrupted_journal(interrupted):
+    # the interrupted run checked out the second version from `main`, after publishing the first one
+    assert interrupted["checkout"] == "main"
+    assert len(interrupted["published"]) == 1
+    return
+
+
+def test_working_tree_restored():
+    repo = git.Repo(os.getcwd())
+    assert not repo.head.is_detached
+    assert repo.active_branch.name == "main"
+    assert not JOURNAL.exists()
+    return
+
+
+def test_published_versions_skipped(interrupted):
+    for ver, mtime in interrupted["mtimes"].items():
+        assert (OUTPATH / ver / "index.html").stat().st_mtime == mtime
+    return
+
+
+def test_no_detached_version():
+    # the detached head of the interrupted run isn't taken for a version, even with `--force`
+    assert sorted(x.name for x in OUTPATH.iterdir() if x.is_dir()) == sorted(VERSIONS_SUPPOSED)
+    return
@@ -0,0 +1,36 @@
+import os
+import json
+import pytest
+import pathlib
+
+VERSION_BROKEN = "v3.0"
+
+
+def _report(run):
+    with open(pathlib.Path(os.getcwd()) / f"report{run}.json", encoding="utf8") as f:
+        return json.load(f)["versions"][VERSION_BROKEN]
+
+
+@pytest.mark.parametrize("run", [1, 2, 3])
+def test_prebuild_failed(run):
+    report = _report(run)
+    assert report["status"] == "failed"
+    assert report["stage"] == "prebuild"
+    return
+
+
+def test_failure_cached():
+    # the second run remembers the failure of the first one, without pre-building it again
+    report = _report(2)
+    assert "failed before" in report["error"]
+    assert "prebuild" not in report
+    return
+
+
+@pytest.mark.parametrize("run", [1, 3])
+def test_prebuilt(run):
+    # the first run, and the third one with `--retry-failed`, pre-build it
+    report = _report(run)
+    assert "sphinx-build exited" in report["error"]
+    assert report["prebuild"]["checkout"] >= 0
+    return
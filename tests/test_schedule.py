@@ -0,0 +1,71 @@
+import os
+import pytest
+import pathlib
+from sphinx_versioned.schedule import BuildHistory, schedule, balance, expected_durations
+
+DURATIONS = {"main": 1.0, "v1.0": 10.0, "v2.0": 6.0, "v3.0": 5.0}
+
+
+@pytest.mark.parametrize(
+    "names, durations, expected",
+    [
+        (["v1.0", "v2.0"], DURATIONS, {"v1.0": 10.0, "v2.0": 6.0}),
+        (["v2.0", "v4.0"], DURATIONS, {"v2.0": 6.0, "v4.0": 6.0}),
+        (["v4.0", "v5.0"], DURATIONS, {"v4.0": 0, "v5.0": 0}),
+        (["main", "v4.0"], {}, {"main": 0, "v4.0": 0}),
+    ],
+)
+def test_expected_durations(names, durations, expected):
+    # unknown versions are expected to take as long as the longest known one
+    assert expected_durations(names, durations) == expected
+    return
+
+
+@pytest.mark.parametrize(
+    "names, main, durations, expected",
+    [
+        (["v3.0", "v1.0", "main", "v2.0"], "main", DURATIONS, ["main", "v1.0", "v2.0", "v3.0"]),
+        (["v3.0", "v1.0", "main", "v2.0"], None, DURATIONS, ["v1.0", "v2.0", "v3.0", "main"]),
+        (["v3.0", "v4.0", "main"], "main", DURATIONS, ["main", "v3.0", "v4.0"]),
+        (["v3.0", "v1.0", "main"], "main", None, ["main", "v3.0", "v1.0"]),
+    ],
+)
+def test_schedule(names, main, durations, expected):
+    # the main branch first, then the longest first; ties keep their order
+    assert schedule(names, main, durations) == expected
+    return
+
+
+@pytest.mark.parametrize(
+    "names, size, durations, expected",
+    [
+        (["main", "v1.0", "v2.0", "v3.0"], 2, DURATIONS, [["main", "v2.0", "v3.0"], ["v1.0"]]),
+        (["main", "v1.0", "v2.0", "v3.0"], 3, DURATIONS, [["main", "v3.0"], ["v1.0"], ["v2.0"]]),
+        (["main", "v1.0", "v2.0", "v3.0"], 2, None, [["main", "v2.0"], ["v1.0", "v3.0"]]),
+        (["main", "v1.0"], 3, DURATIONS, [["main"], ["v1.0"], []]),
+    ],
+)
+def test_balance(names, size, durations, expected):
+    # the longest version goes to the worker with the least work so far
+    assert balance(names, size, "main", durations) == expected
+    return
+
+
+def test_history_saved(tmp_path):
+    history = BuildHistory(tmp_path)
+    history.update({"main": 1.0}, built={"main": "key1"}, failed={"v1.0": "key2"})
+    history.update({"v1.0": 2.0}, built={"v1.0": "key3"})
+
+    history = BuildHistory(tmp_path)
+    assert history.durations == {"main": 1.0, "v1.0": 2.0}
+    assert history.built == {"main": "key1", "v1.0": "key3"}
+    assert history.failed == {}
+    return
+
+
+def test_history_kept_in_output():
+    # the history of the build in the current directory is kept out of the git directory
+    cwd = pathlib.Path(os.getcwd())
+    assert (cwd / "docs" / "_build" / BuildHistory.FILENAME).is_file()
+    assert not (cwd / ".git" / BuildHistory.FILENAME).exists()
+    return
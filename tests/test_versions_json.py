@@ -0,0 +1,63 @@
+import os
+import json
+import pytest
+import pathlib
+from bs4 import BeautifulSoup as bs
+
+VERSIONS_SUPPOSED = {
+    "v1.0": [
+        "index.html",
+    ],
+    "v2.0": ["index.html", "example.html", "code_ref/api_ref/example2.html"],
+    "main": ["index.html", "example.html", "code_ref/api_ref/example2.html"],
+}
+
+BASEPATH = pathlib.Path(os.getcwd()) / "docs"
+OUTPATH = BASEPATH / "_build"
+
+
+def test_versions_json():
+    assert (OUTPATH / "versions.json").is_file()
+
+    with open(OUTPATH / "versions.json", encoding="utf8") as f:
+        versions = json.load(f)
+
+    listed = {**versions["tags"], **versions["branches"]}
+    assert set(VERSIONS_SUPPOSED.keys()) == set(listed.keys())
+    for path in listed.values():
+        assert (OUTPATH / path).is_file()
+    return
+
+
+@pytest.mark.parametrize("ver, file", [(x, z) for x, y in VERSIONS_SUPPOSED.items() for z in y])
+def test_versions_placeholder(ver, file):
+    with open(OUTPATH / ver / file, encoding="utf8") as f:
+        soup = bs(f.read(), features="html.parser")
+
+    # The list of versions isn't rendered into the page
+    injected_code = soup.find_all(class_="injected")
+    assert injected_code
+    for inj in injected_code:
+        assert not set(x.text for x in inj.find_all("a")) & set(VERSIONS_SUPPOSED.keys())
+
+    # but is fetched from `versions.json` by `_versions_json.js`
+    assert any("_versions_json.js" in x.attrs.get("src", "") for x in soup.find_all("script"))
+    placeholders = soup.find_all(class_="sv-versions")
+    assert placeholders
+    for placeholder in placeholders:
+        assert placeholder.attrs["data-current-version"] == ver
+        url = (OUTPATH / ver / file).parent / placeholder.attrs["data-versions"]
+        assert url.resolve() == (OUTPATH / "versions.json").resolve()
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED.keys())
+def test_single_flyout_toggle(ver):
+    with open(OUTPATH / ver / "index.html", encoding="utf8") as f:
+        soup = bs(f.read(), features="html.parser")
+
+    # the theme toggles the flyout menu itself; a second toggle on the same click would cancel it out
+    scripts = [x.attrs["src"].split("?")[0] for x in soup.find_all("script") if x.attrs.get("src")]
+    toggles = [x for x in scripts if "shift-up" in (OUTPATH / ver / x).read_text(encoding="utf8")]
+    assert len(toggles) == 1
+    return
@@ -0,0 +1,36 @@
+import os
+import pytest
+import pathlib
+
+VERSIONS_SUPPOSED = ["v1.0", "v2.0", "main"]
+
+CACHEPATH = pathlib.Path(os.getcwd()) / ".cache"
+OUTPATH = pathlib.Path(os.getcwd()) / "docs" / "_build"
+
+
+def test_worktrees_kept():
+    assert [x for x in (CACHEPATH / "worktrees").iterdir() if (x / ".git").is_file()]
+    return
+
+
+@pytest.mark.parametrize("ver", VERSIONS_SUPPOSED)
+def test_untracked_files_not_published(ver):
+    # files left in a re-used worktree by another version are cleaned before the build
+    assert (OUTPATH / ver / "index.html").is_file()
+    assert not list((OUTPATH / ver).rglob("stale_generated*"))
+    return
+
+
+def test_worktrees_cleaned():
+    for worktree in (CACHEPATH / "worktrees").iterdir():
+        assert not (worktree / "docs" / "stale_generated.rst").exists()
+    return
+
+
+def test_refs_cached():
+    # the refs are cached in `--cache-dir`, neither in the git directory nor in the output
+    cache = ".sphinx-versioned-refs.json"
+    assert (CACHEPATH / cache).is_file()
+    assert not (OUTPATH / cache).exists()
+    assert not (pathlib.Path(os.getcwd()) / ".git" / cache).exists()
+    return